@@ -0,0 +1,120 @@
+import time
+import threading
+from contextlib import contextmanager
+from collections import defaultdict
+import cv2
+
+
+class CapturePool:
+    """Per-path pool of cv2.VideoCapture handles
+
+    Each handle keeps its own decoder cursor, so consumers checking out
+    handles of the same path can decode in parallel. checkout() hands back the
+    idle handle with the lowest cost for the caller (typically the one parked
+    closest before the requested frame), opening a new one while fewer than
+    `size` handles exist for the path. Idle handles are released after
+    `idleTimeout` seconds by a background reaper, running while any handle is idle.
+    """
+    def __init__(self, size=4, idleTimeout=30.0, open=cv2.VideoCapture):
+        self.size = size
+        self.idleTimeout = idleTimeout
+        self._open = open
+        self._cond = threading.Condition()
+        self._idle = defaultdict(list) # path -> [[cap, cursor, lastUsed, generation]]
+        self._count = defaultdict(int) # opened handles per path, idle or checked out
+        self._generation = defaultdict(int)
+        self._reaper = None
+
+    @contextmanager
+    def checkout(self, path, cost=None):
+        """
+        cost: optional function of a handle's cursor, the cheapest idle handle is chosen
+        """
+        cap, generation = self._acquire(path, cost)
+        try:
+            yield cap
+        finally:
+            self._checkin(path, cap, generation)
+
+    def _acquire(self, path, cost):
+        with self._cond:
+            self._releaseIdle()
+            while True:
+                idle = self._idle[path]
+                if idle:
+                    entry = min(idle, key=lambda entry: cost(entry[1])) if cost else idle[-1]
+                    idle.remove(entry)
+                    return entry[0], entry[3]
+                if self._count[path] < self.size:
+                    self._count[path]+=1
+                    generation = self._generation[path]
+                    break
+                self._cond.wait()
+
+        # opening a container is slow, dont hold the lock
+        try:
+            return self._open(path), generation
+        except Exception:
+            with self._cond:
+                self._count[path]-=1
+                self._cond.notify()
+            raise
+
+    def _checkin(self, path, cap, generation):
+        cursor = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+        with self._cond:
+            if generation != self._generation[path]:
+                # invalidated while checked out
+                cap.release()
+                if path in self._count:
+                    self._count[path]-=1
+                    if not self._count[path]:
+                        # dont keep listing the path in stats()
+                        del self._count[path]
+            else:
+                self._idle[path].append([cap, cursor, time.monotonic(), generation])
+                if self._reaper is None:
+                    self._reaper = threading.Thread(target=self._reap, name="CapturePool reaper", daemon=True)
+                    self._reaper.start()
+            self._cond.notify()
+
+    def _reap(self):
+        """release idle handles as they time out, exits once nothing is idle"""
+        with self._cond:
+            while self._idle:
+                oldest = min(entry[2] for idle in self._idle.values() for entry in idle) if any(self._idle.values()) else time.monotonic()
+                self._cond.wait(max(0.0, oldest+self.idleTimeout-time.monotonic()))
+                self._releaseIdle()
+                self._cond.notify_all()
+            self._reaper = None
+
+    def _releaseIdle(self, path=None, timeout=None):
+        timeout = self.idleTimeout if timeout is None else timeout
+        now = time.monotonic()
+        for p in ([path] if path is not None else list(self._idle)):
+            idle = self._idle[p]
+            for entry in [entry for entry in idle if now-entry[2] >= timeout]:
+                idle.remove(entry)
+                entry[0].release()
+                self._count[p]-=1
+            if not idle:
+                del self._idle[p]
+            if not self._count[p]:
+                del self._count[p]
+
+    def releaseIdle(self):
+        """release handles idle for longer than idleTimeout"""
+        with self._cond:
+            self._releaseIdle()
+            self._cond.notify_all()
+
+    def invalidate(self, path):
+        """release the idle handles of path, checked out ones are released on checkin"""
+        with self._cond:
+            self._generation[path]+=1
+            self._releaseIdle(path, timeout=0)
+            self._cond.notify_all()
+
+    def stats(self)->dict:
+        with self._cond:
+            return {path: {'open': count, 'idle': len(self._idle.get(path, ()))} for path, count in self._count.items()}
@@ -0,0 +1,132 @@
+"""Persistent, content-addressed store for memoize(disk=...)
+
+entries live under `directory/<2 hex>/<digest>.npy|.pkl`, where digest hashes the
+function identity and the argument key. ndarrays are stored as .npy and loaded
+memory-mapped, anything else is pickled. files are written to a temp name and
+renamed into place, so concurrent processes never see partial entries. reads
+touch the file, garbage collection deletes the least recently used entries
+once the store grows beyond maxBytes.
+"""
+import os
+import pickle
+import hashlib
+import logging
+import threading
+import numpy as np
+
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "editor")
+
+
+class DiskCache:
+    def __init__(self, directory=DEFAULT_DIRECTORY, maxBytes=10*1024**3):
+        self.directory = directory
+        self.maxBytes = maxBytes
+        self._lock = threading.Lock()
+        self._nbytes = None # estimate, measured on first write
+
+        # stats
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, *parts)->str:
+        """digest of parts, which must have a repr stable across processes"""
+        return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=20).hexdigest()
+
+    def _path(self, digest, ext):
+        return os.path.join(self.directory, digest[:2], digest+ext)
+
+    def get(self, digest, default=None):
+        for ext in ('.npy', '.pkl'):
+            filename = self._path(digest, ext)
+            try:
+                if ext == '.npy':
+                    value = np.load(filename, mmap_mode='r')
+                else:
+                    with open(filename, 'rb') as f:
+                        value = pickle.load(f)
+                os.utime(filename)
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError, EOFError, pickle.UnpicklingError) as err:
+                logging.warning("discard unreadable cache entry {}: {}".format(filename, err))
+                self._remove(filename)
+                continue
+            self.hits+=1
+            return value
+        self.misses+=1
+        return default
+
+    def put(self, digest, value):
+        ext = '.npy' if isinstance(value, np.ndarray) and not value.dtype.hasobject else '.pkl'
+        filename = self._path(digest, ext)
+        tmp = "{}.{}.{}.tmp".format(filename, os.getpid(), threading.get_ident())
+        try:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            with open(tmp, 'wb') as f:
+                if ext == '.npy':
+                    np.save(f, value, allow_pickle=False)
+                else:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            # an overwritten entry no longer counts
+            try:
+                previous = os.path.getsize(filename)
+            except OSError:
+                previous = 0
+            os.replace(tmp, filename)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError) as err:
+            logging.warning("cant store cache entry {}: {}".format(filename, err))
+            self._remove(tmp)
+            return
+
+        with self._lock:
+            if self._nbytes is None:
+                self._nbytes = sum(size for filename, size, atime in self._entries())
+            else:
+                self._nbytes += os.path.getsize(filename)-previous
+            needsCollect = self._nbytes > self.maxBytes
+        if needsCollect:
+            self.collect()
+
+    def _entries(self):
+        for root, dirs, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith('.tmp'):
+                    continue
+                filename = os.path.join(root, name)
+                try:
+                    stat = os.stat(filename)
+                except FileNotFoundError:
+                    continue
+                yield filename, stat.st_size, max(stat.st_atime, stat.st_mtime)
+
+    @staticmethod
+    def _remove(filename):
+        try:
+            os.remove(filename)
+        except OSError:
+            # already collected by another process, or mapped on windows
+            pass
+
+    def collect(self, maxBytes=None):
+        """delete least recently used entries until the store fits maxBytes"""
+        maxBytes = self.maxBytes if maxBytes is None else maxBytes
+        with self._lock:
+            entries = sorted(self._entries(), key=lambda entry: entry[2])
+            nbytes = sum(size for filename, size, atime in entries)
+            for filename, size, atime in entries:
+                if nbytes <= maxBytes:
+                    break
+                self._remove(filename)
+                nbytes -= size
+            self._nbytes = nbytes
+
+    def clear(self):
+        self.collect(maxBytes=0)
+
+
+_default = None
+def default()->DiskCache:
+    global _default
+    if _default is None:
+        _default = DiskCache()
+    return _default
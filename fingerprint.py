@@ -0,0 +1,79 @@
+"""Content fingerprints of ndarrays, to use arrays as cache keys
+
+the raw buffer is hashed in chunks together with dtype and shape. with
+strict=False, buffers larger than SAMPLE_THRESHOLD are only sampled at SAMPLES
+evenly spaced chunks, which misses small differences between eg. two 4K frames,
+so it is opt-in and never used for cache keys. fingerprints of arrays that
+cannot change (read-only all the way down to their base, like the frames in
+read.frameCache) are memoized per array object.
+"""
+import hashlib
+import weakref
+import numpy as np
+
+CHUNK_SIZE = 1<<20
+SAMPLE_THRESHOLD = 16<<20
+SAMPLES = 64
+SAMPLE_SIZE = 64<<10
+
+_memo = dict() # (id, strict) -> fingerprint
+
+
+def _isFrozen(arr: np.ndarray)->bool:
+    while isinstance(arr, np.ndarray):
+        if arr.flags.writeable:
+            return False
+        arr = arr.base
+    return True
+
+
+def _hash(arr: np.ndarray, strict: bool)->str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(arr.dtype.str.encode('ascii'))
+    h.update(repr(arr.shape).encode('ascii'))
+    buf = np.ascontiguousarray(arr).reshape(-1).view(np.uint8)
+    size = buf.size
+    if strict or size <= SAMPLE_THRESHOLD:
+        for start in range(0, size, CHUNK_SIZE):
+            h.update(buf[start:start+CHUNK_SIZE])
+    else:
+        h.update(b'sampled')
+        step = (size-SAMPLE_SIZE)//(SAMPLES-1)
+        for i in range(SAMPLES):
+            h.update(buf[i*step:i*step+SAMPLE_SIZE])
+    return h.hexdigest()
+
+
+def fingerprint(arr: np.ndarray, strict=True)->str:
+    """hex digest of the array's dtype, shape and content"""
+    if arr.dtype.hasobject:
+        raise TypeError("cant fingerprint object arrays")
+
+    if not _isFrozen(arr):
+        return _hash(arr, strict)
+
+    key = (id(arr), strict)
+    digest = _memo.get(key)
+    if digest is None:
+        digest = _memo[key] = _hash(arr, strict)
+        weakref.finalize(arr, _memo.pop, key, None)
+    return digest
+
+
+def pathPoints(path)->np.ndarray:
+    """element coordinates and types of a QPainterPath as an (n, 3) array"""
+    elements = [path.elementAt(i) for i in range(path.elementCount())]
+    return np.array([(e.x, e.y, int(e.type)) for e in elements], dtype=np.float64).reshape(-1, 3)
+
+
+def hashable(value, strict=True):
+    """value, with ndarrays and painter paths replaced by their fingerprints, to use as a dict key"""
+    if isinstance(value, np.ndarray):
+        return ('ndarray', fingerprint(value, strict))
+    if isinstance(value, (tuple, list)):
+        return type(value).__name__, tuple(hashable(item, strict) for item in value)
+    if isinstance(value, dict):
+        return 'dict', tuple(sorted((key, hashable(item, strict)) for key, item in value.items()))
+    if hasattr(value, 'elementCount') and hasattr(value, 'elementAt'):
+        return ('path', fingerprint(pathPoints(value), strict))
+    return value
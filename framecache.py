@@ -0,0 +1,109 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+
+
+class FrameCache:
+    """Byte-budgeted LRU cache of decoded frames, keyed by (path, frame)
+
+    frames are evicted least-recently-used first once the total size of the
+    cached ndarrays exceeds maxBytes. cached frames are shared by every reader
+    and made read-only.
+    """
+    def __init__(self, maxBytes=1024**3):
+        self.maxBytes = maxBytes
+        self._frames = OrderedDict()
+        self._bytesPerPath = dict()
+        self._nbytes = 0
+        self._lock = threading.RLock()
+
+        # counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path, frame, count=True)->np.ndarray:
+        """the cached frame or None, count=False for internal probes that are not reads"""
+        key = (path, frame)
+        with self._lock:
+            img = self._frames.get(key)
+            if img is None:
+                if count:
+                    self.misses+=1
+                return None
+            self._frames.move_to_end(key)
+            if count:
+                self.hits+=1
+            return img
+
+    def put(self, path, frame, img: np.ndarray):
+        if img is None:
+            return
+        key = (path, frame)
+        with self._lock:
+            if key in self._frames:
+                self._remove(key)
+            if img.nbytes > self.maxBytes:
+                # would evict everything else and still not fit
+                return
+            img.flags.writeable = False
+            self._frames[key] = img
+            self._nbytes += img.nbytes
+            self._bytesPerPath[path] = self._bytesPerPath.get(path, 0) + img.nbytes
+            self._evict()
+
+    def contains(self, path, frame)->bool:
+        with self._lock:
+            return (path, frame) in self._frames
+
+    def invalidate(self, path=None):
+        """drop every cached frame of path, or of all paths when path is None"""
+        with self._lock:
+            if path is None:
+                self._frames.clear()
+                self._bytesPerPath.clear()
+                self._nbytes = 0
+                return
+            for key in [key for key in self._frames if key[0] == path]:
+                self._remove(key)
+
+    def setMaxBytes(self, maxBytes):
+        with self._lock:
+            self.maxBytes = maxBytes
+            self._evict()
+
+    @property
+    def nbytes(self):
+        return self._nbytes
+
+    def bytesPerPath(self)->dict:
+        with self._lock:
+            return dict(self._bytesPerPath)
+
+    def stats(self)->dict:
+        with self._lock:
+            return {
+                'frames': len(self._frames),
+                'nbytes': self._nbytes,
+                'maxBytes': self.maxBytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+    def _remove(self, key):
+        img = self._frames.pop(key)
+        path = key[0]
+        self._nbytes -= img.nbytes
+        self._bytesPerPath[path] -= img.nbytes
+        if self._bytesPerPath[path] <= 0:
+            del self._bytesPerPath[path]
+
+    def _evict(self):
+        while self._nbytes > self.maxBytes and self._frames:
+            key = next(iter(self._frames))
+            self._remove(key)
+            self.evictions+=1
+
+    def __len__(self):
+        return len(self._frames)
@@ -0,0 +1,104 @@
+"""On-disk store of decoded frames
+
+one fixed-size record per frame in a np.memmap backed file next to the media:
+    IMG_9148.MOV.framestore        frame records, shape (frameCount, height, width, channels)
+    IMG_9148.MOV.framestore.valid  one byte per frame, set once its record is written
+    IMG_9148.MOV.framestore.json   shape, dtype and the source mtime and size
+frames are handed back as read-only views into the mapping, so they are not
+copied and the OS page cache is shared between processes and sessions.
+"""
+import os
+import json
+import threading
+import logging
+import numpy as np
+
+
+class FrameStore:
+    def __init__(self, filename, frameCount, frameShape, dtype):
+        self.filename = filename
+        self.frameCount = frameCount
+        self.frameShape = tuple(frameShape)
+        self.dtype = np.dtype(dtype)
+        shape = (frameCount,)+self.frameShape
+
+        mode = 'r+' if os.path.exists(filename) else 'w+'
+        self._writable = np.memmap(filename, dtype=self.dtype, mode=mode, shape=shape)
+        self._readable = np.memmap(filename, dtype=self.dtype, mode='r', shape=shape)
+        mode = 'r+' if os.path.exists(filename+".valid") else 'w+'
+        self._valid = np.memmap(filename+".valid", dtype=np.uint8, mode=mode, shape=(frameCount,))
+
+    def contains(self, frame)->bool:
+        return 0 <= frame < self.frameCount and bool(self._valid[frame])
+
+    def get(self, frame)->np.ndarray:
+        """read-only view of the frame record, or None when not stored yet"""
+        if not self.contains(frame):
+            return None
+        return self._readable[frame]
+
+    def put(self, frame, img: np.ndarray)->np.ndarray:
+        if not 0 <= frame < self.frameCount or img.shape != self.frameShape:
+            return img
+        # data first, then the flag other readers check. both are shared
+        # through the page cache, writeback to disk waits for flush()
+        self._writable[frame] = img
+        self._valid[frame] = 1
+        return self._readable[frame]
+
+    def flush(self):
+        self._writable.flush()
+        self._valid.flush()
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime, stat.st_size
+
+
+_stores = dict()
+_lock = threading.Lock()
+def get(path, frameCount=None, img: np.ndarray=None)->FrameStore:
+    """Return the frame store of path
+    an existing store is opened when it matches the source on disk, otherwise
+    frameCount and an example frame are needed to create it. returns None when
+    neither is possible.
+    """
+    path = str(path)
+    with _lock:
+        store = _stores.get(path)
+        if store is not None:
+            return store
+
+        filename = path+".framestore"
+        try:
+            with open(filename+".json") as f:
+                header = json.load(f)
+            if (header['mtime'], header['size']) == _signature(path):
+                store = FrameStore(filename, header['frameCount'], header['frameShape'], header['dtype'])
+        except (OSError, ValueError, KeyError):
+            store = None
+
+        if store is None and frameCount and img is not None:
+            try:
+                for stale in (filename, filename+".valid"):
+                    if os.path.exists(stale):
+                        os.remove(stale)
+                store = FrameStore(filename, frameCount, img.shape, img.dtype)
+                mtime, size = _signature(path)
+                header = {'mtime': mtime, 'size': size, 'frameCount': frameCount, 'frameShape': list(img.shape), 'dtype': img.dtype.str}
+                with open(filename+".json", 'w') as f:
+                    json.dump(header, f)
+            except OSError as err:
+                logging.warning("cant create frame store for {}: {}".format(path, err))
+                store = None
+
+        if store is not None:
+            _stores[path] = store
+        return store
+
+
+def close(path):
+    store = _stores.pop(str(path), None)
+    if store is not None:
+        store.flush()
@@ -8,10 +8,13 @@ from typing import Any
 from nptyping import NDArray, Bool
 import cv2
 
-from utils import convert_cvImgToPixmap
-from read import read
+from editor.utils import convert_cvImgToPixmap, memoize
+from editor.read import read
+from editor import profiler
 import pathlib
 
+@memoize(maxbytes=512*1024**2)
+@profiler.profiled("tps")
 def tps(sourcePoints, targetPoints, img):
     # thinplate spline deform
     tps = cv2.createThinPlateSplineShapeTransformer()
@@ -29,14 +32,20 @@ def divideCurve(curve: QPainterPath, n: int)->NDArray[(2,Any)]:
     return np.array([[point.x(), point.y()] for point in points])
 
 
-def evaluate(filePath: pathlib.Path, frame, sourcePath: QPainterPath, targetPath: QPainterPath)->NDArray[(2, Any), np.float32]:
-    img = read(filePath, frame)
-    # return img
-
+@profiler.profiled("evaluate")
+def evaluate(filePath: pathlib.Path, frame, sourcePath: QPainterPath, targetPath: QPainterPath, sharedCache=None)->NDArray[(2, Any), np.float32]:
+    """
+    sharedCache: optional sharedcache.SharedFrameCache, when evaluating in worker processes
+    """
     # get points
     sourcePoints = divideCurve(sourcePath, 10)
     targetPoints = divideCurve(targetPath, 10)
 
+    if sharedCache is not None:
+        with sharedCache.frame(filePath, frame) as img:
+            return tps(sourcePoints, targetPoints, img)
+
+    img = read(filePath, frame)
     deformed = tps(sourcePoints, targetPoints, img)
     return deformed
 
@@ -148,8 +157,10 @@ class GBController(QObject):
 
         """ output viewer """
         img = self.model.output
-        pixmap = convert_cvImgToPixmap(img)
-        self.pixmapItem.setPixmap(pixmap)
+        with profiler.scope("convert"):
+            pixmap = convert_cvImgToPixmap(img)
+        with profiler.scope("paint"):
+            self.pixmapItem.setPixmap(pixmap)
 
 
 if __name__ == "__main__":
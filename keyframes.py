@@ -0,0 +1,154 @@
+import os
+import json
+import bisect
+import shutil
+import logging
+import subprocess
+import threading
+from collections import defaultdict
+import cv2
+
+
+def indexPath(path: str)->str:
+    """keyframe index is persisted next to the media file"""
+    return str(path)+".keyframes.json"
+
+
+def _signature(path: str):
+    stat = os.stat(path)
+    return stat.st_mtime, stat.st_size
+
+
+def _probeKeyframes(path: str):
+    """read keyframe positions from the packet flags, without decoding"""
+    if shutil.which("ffprobe") is None:
+        return None
+    cmd = ["ffprobe", "-v", "error", "-select_streams", "v:0",
+           "-show_entries", "packet=pts,flags", "-of", "csv=p=0", str(path)]
+    try:
+        out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError) as err:
+        logging.warning("ffprobe failed on {}: {}".format(path, err))
+        return None
+
+    packets = []
+    for line in out.splitlines():
+        pts, _, flags = line.partition(",")
+        if pts in ("", "N/A"):
+            continue
+        packets.append((int(pts), "K" in flags))
+
+    # packets come in decode order, frame numbers are in presentation order
+    packets.sort()
+    return [i for i, (pts, isKey) in enumerate(packets) if isKey]
+
+
+def _scanKeyframes(path: str):
+    """fallback: grab every packet and ask the backend whether it was a keyframe"""
+    if not hasattr(cv2, "CAP_PROP_LRF_HAS_KEY_FRAME"):
+        return None
+    cap = cv2.VideoCapture(str(path))
+    # the keyframe flag is only reported for raw, undecoded packets
+    if not cap.set(cv2.CAP_PROP_FORMAT, -1):
+        cap.release()
+        return None
+    keyframes = []
+    frame = 0
+    while cap.grab():
+        if cap.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+            keyframes.append(frame)
+        frame+=1
+    cap.release()
+    return keyframes or None
+
+
+def buildIndex(path: str):
+    keyframes = _probeKeyframes(path)
+    if keyframes is None:
+        keyframes = _scanKeyframes(path)
+    if keyframes is None:
+        return None
+
+    mtime, size = _signature(path)
+    data = {'mtime': mtime, 'size': size, 'keyframes': keyframes}
+    # unique per writer, other processes may index the same file
+    tmp = "{}.{}.{}.tmp".format(indexPath(path), os.getpid(), threading.get_ident())
+    try:
+        with open(tmp, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp, indexPath(path))
+    except OSError as err:
+        logging.warning("cant persist keyframe index for {}: {}".format(path, err))
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return keyframes
+
+
+def loadIndex(path: str):
+    """return the persisted index, or None when missing or stale"""
+    try:
+        with open(indexPath(path)) as f:
+            data = json.load(f)
+        if (data['mtime'], data['size']) != _signature(path):
+            return None
+        return data['keyframes']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+_indices = dict()
+_builders = dict() # path -> thread building its index
+_generation = defaultdict(int)
+_lock = threading.Lock()
+
+
+def _build(path: str, generation: int):
+    keyframes = None
+    try:
+        keyframes = buildIndex(path)
+    finally:
+        with _lock:
+            if _generation[path] == generation:
+                _indices[path] = keyframes
+                _builders.pop(path, None)
+
+
+def getKeyframes(path: str, wait: bool=False):
+    """sorted list of keyframe numbers of path, or None when it cant be determined
+    a missing index is built once per path on a background thread, None is
+    returned until it is ready unless wait is set
+    """
+    with _lock:
+        if path in _indices:
+            return _indices[path]
+
+    keyframes = loadIndex(path)
+    with _lock:
+        if path in _indices:
+            return _indices[path]
+        if keyframes is not None or not os.path.isfile(path):
+            _indices[path] = keyframes
+            return keyframes
+        builder = _builders.get(path)
+        if builder is None:
+            builder = _builders[path] = threading.Thread(target=_build, args=(path, _generation[path]), name="keyframes "+str(path), daemon=True)
+            builder.start()
+
+    if not wait:
+        return None
+    builder.join()
+    with _lock:
+        return _indices.get(path)
+
+
+def invalidate(path: str):
+    with _lock:
+        _indices.pop(path, None)
+        _builders.pop(path, None)
+        _generation[path]+=1
+
+
+def nearestKeyframe(keyframes, frame)->int:
+    """the last keyframe at or before frame"""
+    i = bisect.bisect_right(keyframes, frame)
+    return keyframes[i-1] if i>0 else 0
@@ -0,0 +1,177 @@
+"""Hierarchical profiler
+
+    from editor import profiler
+    profiler.enable()
+    with profiler.scope("read"):
+        with profiler.scope("decode"):
+            ...
+    print(profiler.summary())
+    profiler.saveChromeTrace("trace.json") # open in chrome://tracing or ui.perfetto.dev
+
+scopes nest per thread, statistics are aggregated per path ("read/decode").
+while disabled, scope() returns a shared no-op context manager.
+"""
+import os
+import json
+import time
+import functools
+import threading
+from collections import deque
+
+enabled = False
+
+# per path: at most MAX_SAMPLES recent durations feed the percentiles
+MAX_SAMPLES = 4096
+# events kept for the chrome trace
+MAX_EVENTS = 100000
+
+_lock = threading.Lock()
+_local = threading.local()
+_stats = dict()
+_events = deque(maxlen=MAX_EVENTS)
+
+
+class ScopeStats:
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+
+    def add(self, duration):
+        self.count+=1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.samples.append(duration)
+
+    def percentile(self, p):
+        if not self.samples:
+            return 0
+        samples = sorted(self.samples)
+        return samples[min(len(samples)-1, int(p/100*len(samples)))]
+
+    @property
+    def mean(self):
+        return self.total/self.count if self.count else 0
+
+
+class _NullScope:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        return False
+
+_nullScope = _NullScope()
+
+
+class _Scope:
+    __slots__ = ('name', 'path', 'start')
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        self.path = stack[-1]+"/"+self.name if stack else self.name
+        stack.append(self.path)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        duration = time.perf_counter_ns()-self.start
+        _local.stack.pop()
+        record(self.path, self.start, duration)
+        return False
+
+
+def scope(name):
+    """time the block as a child of the current scope of this thread"""
+    if not enabled:
+        return _nullScope
+    return _Scope(name)
+
+
+def profiled(name=None):
+    """decorator, time every call of the function as a scope"""
+    def decorator(fn):
+        scopeName = name or fn.__qualname__
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            with _Scope(scopeName):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record(path, start, duration, thread=None):
+    """add a measurement taken elsewhere, eg. a GPU timer, times in ns"""
+    if thread is None:
+        thread = threading.get_ident()
+    with _lock:
+        stats = _stats.get(path)
+        if stats is None:
+            stats = _stats[path] = ScopeStats()
+        stats.add(duration)
+        _events.append((path, thread, start, duration))
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+        _events.clear()
+
+
+def stats()->dict:
+    """path -> {count, mean, p50, p95, max}, durations in ms"""
+    with _lock:
+        return {path: {
+            'count': s.count,
+            'mean': s.mean/1e6,
+            'p50': s.percentile(50)/1e6,
+            'p95': s.percentile(95)/1e6,
+            'max': s.max/1e6
+        } for path, s in _stats.items()}
+
+
+def summary()->str:
+    lines = ["{:<48} {:>8} {:>9} {:>9} {:>9} {:>9}".format("scope (ms)", "count", "mean", "p50", "p95", "max")]
+    for path, s in sorted(stats().items()):
+        depth = path.count("/")
+        label = "  "*depth+path.rsplit("/", 1)[-1]
+        lines.append("{:<48} {:>8} {:>9.3f} {:>9.3f} {:>9.3f} {:>9.3f}".format(label, s['count'], s['mean'], s['p50'], s['p95'], s['max']))
+    return "\n".join(lines)
+
+
+def chromeTrace()->dict:
+    """events in the chrome trace event format"""
+    pid = os.getpid()
+    with _lock:
+        events = list(_events)
+    return {'traceEvents': [{
+        'name': path.rsplit("/", 1)[-1],
+        'cat': path,
+        'ph': 'X',
+        'ts': start/1000,
+        'dur': duration/1000,
+        'pid': pid,
+        'tid': thread
+    } for path, thread, start, duration in events]}
+
+
+def saveChromeTrace(filename):
+    with open(filename, 'w') as f:
+        json.dump(chromeTrace(), f)
@@ -0,0 +1,210 @@
+"""Downscaled intra-frame proxies for scrubbing long-GOP footage
+
+a proxy is a folder of MJPEG chunks of `chunkSize` frames next to the source:
+    IMG_9148.MOV.proxy50/manifest.json
+    IMG_9148.MOV.proxy50/00000.avi
+    IMG_9148.MOV.proxy50/00001.avi
+chunks are written to a temp file and renamed when complete, so an interrupted
+transcode resumes at the first missing chunk. the manifest records the source
+mtime and size, a changed source discards the proxy.
+"""
+import os
+import json
+import shutil
+import time
+import logging
+import threading
+import multiprocessing
+import cv2
+import numpy as np
+from editor.write import VideoWriter
+
+CHUNK_SIZE = 100
+
+# seconds before a missing or incomplete manifest is read again
+MANIFEST_RECHECK = 1.0
+
+
+def proxyDir(path, scale)->str:
+    return "{}.proxy{:d}".format(path, round(scale*100))
+
+
+def chunkPath(path, scale, chunk)->str:
+    return os.path.join(proxyDir(path, scale), "{:05d}.avi".format(chunk))
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime, stat.st_size
+
+
+def _readManifest(path, scale):
+    try:
+        with open(os.path.join(proxyDir(path, scale), "manifest.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _writeManifest(path, scale, manifest):
+    filename = os.path.join(proxyDir(path, scale), "manifest.json")
+    with open(filename+".tmp", 'w') as f:
+        json.dump(manifest, f)
+    os.replace(filename+".tmp", filename)
+
+
+def isValid(path, scale)->bool:
+    manifest = _readManifest(path, scale)
+    if manifest is None:
+        return False
+    try:
+        return (manifest['mtime'], manifest['size']) == _signature(path)
+    except OSError:
+        return False
+
+
+def transcode(path, scale=0.5, chunkSize=CHUNK_SIZE):
+    """write the missing chunks of the proxy, runs in the worker process"""
+    folder = proxyDir(path, scale)
+    if os.path.isdir(folder) and not isValid(path, scale):
+        shutil.rmtree(folder)
+    os.makedirs(folder, exist_ok=True)
+
+    cap = cv2.VideoCapture(str(path))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 24
+    frameCount = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    mtime, size = _signature(path)
+    manifest = {'mtime': mtime, 'size': size, 'scale': scale, 'chunkSize': chunkSize, 'frameCount': frameCount, 'complete': False}
+    _writeManifest(path, scale, manifest)
+
+    chunks = (frameCount+chunkSize-1)//chunkSize
+    for chunk in range(chunks):
+        filename = chunkPath(path, scale, chunk)
+        if os.path.exists(filename):
+            continue
+        cap.set(cv2.CAP_PROP_POS_FRAMES, chunk*chunkSize)
+        # keep the container extension, VideoWriter picks the muxer from it
+        tmp = filename[:-len(".avi")]+".tmp.avi"
+        with VideoWriter(tmp, fps=fps, fourcc="MJPG") as writer:
+            for i in range(chunkSize):
+                ret, img = cap.read()
+                if not ret:
+                    break
+                writer.write(cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA))
+        if os.path.exists(tmp):
+            os.replace(tmp, filename)
+    cap.release()
+
+    # a chunk that decoded no frames was never renamed into place
+    missing = [chunk for chunk in range(chunks) if not os.path.exists(chunkPath(path, scale, chunk))]
+    if missing:
+        logging.warning("proxy of {} is missing chunks {}".format(path, missing))
+        return
+    manifest['complete'] = True
+    _writeManifest(path, scale, manifest)
+
+
+_builds = dict()
+def build(path, scale=0.5, chunkSize=CHUNK_SIZE)->multiprocessing.Process:
+    """start transcoding the proxy in a worker process, unless one is running already"""
+    key = (str(path), scale)
+    process = _builds.get(key)
+    if process is not None and process.is_alive():
+        return process
+    forget(path)
+    process = multiprocessing.Process(target=transcode, args=(str(path), scale, chunkSize), daemon=True)
+    process.start()
+    _builds[key] = process
+    return process
+
+
+def cancel(path, scale=0.5):
+    """stop a running transcode, completed chunks are kept"""
+    process = _builds.pop((str(path), scale), None)
+    if process is not None and process.is_alive():
+        process.terminate()
+        process.join()
+
+
+_manifests = dict() # (path, scale) -> [validated manifest or None, time read, chunks seen on disk]
+_manifestsLock = threading.Lock()
+def _manifest(path, scale):
+    """the validated manifest, cached until forget(). missing or incomplete ones are re-read after MANIFEST_RECHECK"""
+    key = (str(path), scale)
+    with _manifestsLock:
+        entry = _manifests.get(key)
+    if entry is not None and ((entry[0] is not None and entry[0]['complete']) or time.monotonic()-entry[1] < MANIFEST_RECHECK):
+        return entry
+    manifest = _readManifest(path, scale)
+    try:
+        if manifest is not None and (manifest['mtime'], manifest['size']) != _signature(path):
+            manifest = None
+    except OSError:
+        manifest = None
+    entry = [manifest, time.monotonic(), entry[2] if entry is not None and manifest is not None else set()]
+    with _manifestsLock:
+        _manifests[key] = entry
+    return entry
+
+
+def forget(path):
+    """drop the cached manifests and the open chunk of path, eg. when the source changed"""
+    with _manifestsLock:
+        for key in [key for key in _manifests if key[0] == str(path)]:
+            del _manifests[key]
+    with _chunkLock:
+        if _chunk[0] is not None and _chunk[0].startswith(str(path)+".proxy"):
+            _chunk[1].release()
+            _chunk[:] = [None, None]
+
+
+def locate(path, scale, frame):
+    """chunk file and frame number within it, or None when not transcoded yet"""
+    manifest, _, chunks = _manifest(path, scale)
+    if manifest is None:
+        return None
+    if not 0 <= frame < manifest['frameCount']:
+        return None
+    chunk, local = divmod(frame, manifest['chunkSize'])
+    filename = chunkPath(path, scale, chunk)
+    if not manifest['complete'] and chunk not in chunks:
+        if not os.path.exists(filename):
+            return None
+        chunks.add(chunk)
+    return filename, local
+
+
+_chunk = [None, None] # filename, capture of the chunk read last
+_chunkLock = threading.Lock()
+def readFrame(filename, frame)->np.ndarray:
+    """decode a frame of a chunk with a plain sequential capture
+    chunks are intra-coded, a seek costs a single frame, so no keyframe index or capture pool
+    """
+    with _chunkLock:
+        if _chunk[0] != filename:
+            if _chunk[1] is not None:
+                _chunk[1].release()
+            _chunk[:] = [filename, cv2.VideoCapture(filename)]
+        cap = _chunk[1]
+        if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != frame:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, frame)
+        ret, img = cap.read()
+    return img if ret else None
+
+
+def downscale(img: np.ndarray, scale)->np.ndarray:
+    """resize a full resolution frame to match the proxy"""
+    if img is None:
+        return None
+    return cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+
+def invalidate(path):
+    """remove every proxy of path"""
+    forget(path)
+    folder, name = os.path.split(str(path))
+    for entry in os.listdir(folder or "."):
+        if entry.startswith(name+".proxy"):
+            for key in [key for key in _builds if key[0] == str(path)]:
+                cancel(*key)
+            shutil.rmtree(os.path.join(folder, entry), ignore_errors=True)
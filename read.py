@@ -1,29 +1,152 @@
 import cv2
 import numpy as np
 from editor.utils import memoize
+from editor.framecache import FrameCache
+from editor.capturepool import CapturePool
+from editor import keyframes
+from editor import sequence
+from editor import proxy
+from editor import framestore
+from editor import profiler
 
 
-@memoize
+# decoded frames of every path, bounded by a byte budget
+frameCache = FrameCache(maxBytes=1024**3)
+
+# decoder handles, each parked at its own position
+capturePool = CapturePool(size=4, idleTimeout=30.0)
+
+# cost of a codec seek, expressed in decoded frames
+SEEK_COST = 8
+
+# keep decoded video frames in a memory-mapped store next to the media as well
+USE_FRAME_STORE = False
+
+
+@memoize(maxsize=32)
 def getVideoCapture(filePath: str)->cv2.VideoCapture:
     return cv2.VideoCapture(filePath)
 
 
-@memoize
-def readCapture(cap:cv2.VideoCapture, frame)->np.ndarray:
-    cursor = cap.get(cv2.CAP_PROP_POS_FRAMES)
-    if frame!=cursor:
-        cap.set(cv2.CAP_PROP_POS_FRAMES, frame)
+def planSeek(keyframeIndex, cursor: int, frame: int)->int:
+    """Return the frame to start decoding from to reach frame
+    cursor is returned when decoding forward is cheaper than seeking,
+    otherwise the nearest keyframe before frame
+    """
+    if frame == cursor:
+        return cursor
+
+    if keyframeIndex is None:
+        # unknown GOP structure: only short forward jumps are decoded
+        if 0 < frame-cursor <= SEEK_COST:
+            return cursor
+        return frame
 
-    ret, img = cap.read()
+    keyframe = keyframes.nearestKeyframe(keyframeIndex, frame)
+    if cursor < frame and (keyframe <= cursor or frame-cursor <= SEEK_COST+frame-keyframe):
+        return cursor
+    return keyframe
+
+
+def seekCost(keyframeIndex, cursor: int, frame: int)->int:
+    """number of frames to decode (plus SEEK_COST for a seek) to reach frame from cursor"""
+    start = planSeek(keyframeIndex, cursor, frame)
+    if start == cursor:
+        return frame-cursor
+    return SEEK_COST+frame-start
+
+
+def _keep(cap: cv2.VideoCapture, path: str, frame: int, img: np.ndarray)->np.ndarray:
+    """put a decoded frame into frameCache and the frame store, returns the frame to hand out"""
+    if USE_FRAME_STORE and img is not None:
+        store = framestore.get(path, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), img)
+        if store is not None:
+            img = store.put(frame, img)
+    frameCache.put(path, frame, img)
     return img
 
 
-def read(path: str, frame: int)->np.ndarray:
+@profiler.profiled("decode")
+def decodeTo(cap: cv2.VideoCapture, path: str, frame: int)->np.ndarray:
+    """decode frame following planSeek, every intermediate frame is put into frameCache"""
+    cursor = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+    start = planSeek(keyframes.getKeyframes(path), cursor, frame)
+    if start != cursor:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+
+    for i in range(start, frame):
+        # a single lookup, the frame may be evicted by another thread in between
+        if frameCache.get(path, i, count=False) is not None:
+            ret = cap.grab()
+        else:
+            ret, img = cap.read()
+            _keep(cap, path, i, img)
+        if not ret:
+            return None
+
+    ret, img = cap.read()
+    if not ret:
+        return None
+    return _keep(cap, path, frame, img)
+
+
+@profiler.profiled("read")
+def read(path: str, frame: int, scale: float=1.0)->np.ndarray:
     """Return a frame of an video or image sequence a path
-    opencv based read function with memoize builtin: each frame of every path
+    opencv based read function, decoded frames are kept in frameCache
+    image sequences are given as `shot.%04d.png` or `shot.####.png`
+    scale<1 asks for a preview resolution, served from the proxy once proxy.build transcoded it
     """
-    cap = getVideoCapture(path)
-    return readCapture(cap, frame)
+    if scale != 1.0:
+        location = proxy.locate(path, scale, frame)
+        if location is not None:
+            img = frameCache.get(*location)
+            if img is None:
+                img = proxy.readFrame(*location)
+                if img is not None:
+                    frameCache.put(*location, img)
+            if img is not None:
+                return img
+        return proxy.downscale(read(path, frame), scale)
+
+    img = frameCache.get(path, frame)
+    if img is not None:
+        return img
+
+    if sequence.isSequence(path):
+        return sequence.read(path, frame, frameCache)
+
+    if USE_FRAME_STORE:
+        store = framestore.get(path)
+        if store is not None and store.contains(frame):
+            img = store.get(frame)
+            frameCache.put(path, frame, img)
+            return img
+
+    keyframeIndex = keyframes.getKeyframes(path)
+    cost = lambda cursor: seekCost(keyframeIndex, cursor, frame)
+    with capturePool.checkout(path, cost) as cap:
+        # may have been decoded while waiting for a handle
+        img = frameCache.get(path, frame, count=False)
+        if img is not None:
+            return img
+        return decodeTo(cap, path, frame)
+
+
+def invalidate(path: str):
+    """drop cached frames and the capture handles of path, eg. when the file changed on disk"""
+    for cached in frameCache.bytesPerPath():
+        if str(cached).startswith(str(path)+".proxy"):
+            frameCache.invalidate(cached)
+    frameCache.invalidate(path)
+    proxy.forget(path)
+    framestore.close(path)
+    keyframes.invalidate(path)
+    sequence.invalidate(path)
+    capturePool.invalidate(path)
+    cap = getVideoCapture.pop(path)
+    if cap is not None:
+        cap.release()
 
 
 if __name__ == "__main__":
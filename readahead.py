@@ -0,0 +1,100 @@
+import queue
+import logging
+import threading
+from editor import read
+from editor import sequence
+
+
+class ReadAhead:
+    """Decode upcoming frames in a worker thread
+
+    request(path, frame) is called with every frame the player shows, the
+    playback direction and rate are derived from consecutive requests and the
+    next `depth` frames are queued for decoding into read.frameCache.
+    Jumping further than `depth` frames cancels the outstanding work.
+    """
+    def __init__(self, depth=12, maxPending=24):
+        self.depth = depth
+        self._queue = queue.Queue(maxsize=maxPending)
+        self._generation = 0
+        self._lastRequest = None
+        self._rate = 1
+        self._futures = []
+        self._thread = None
+        self._stopped = False
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="ReadAhead", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stopped = True
+        self.cancel()
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def cancel(self):
+        """drop every queued frame, frames currently decoding are finished"""
+        self._generation+=1
+        for future in self._futures:
+            future.cancel()
+        self._futures = []
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+
+    def predict(self, frame):
+        return [frame+self._rate*i for i in range(1, self.depth+1) if frame+self._rate*i>=0]
+
+    def request(self, path, frame):
+        if self._thread is None:
+            self.start()
+
+        # update playback direction and rate
+        if self._lastRequest is not None and self._lastRequest[0] == path:
+            delta = frame-self._lastRequest[1]
+            if delta == 0:
+                return
+            if abs(delta) > self.depth:
+                self.cancel()
+            else:
+                self._rate = delta
+        else:
+            self.cancel()
+        self._lastRequest = path, frame
+
+        if sequence.isSequence(path):
+            # images decode independently, fan out to the sequence pool
+            self._futures = [future for future in self._futures if not future.done()]
+            self._futures+=sequence.prefetch(path, self.predict(frame), read.frameCache)
+            return
+
+        generation = self._generation
+        for predicted in self.predict(frame):
+            if read.frameCache.contains(path, predicted):
+                continue
+            try:
+                self._queue.put_nowait((generation, path, predicted))
+            except queue.Full:
+                break
+
+    def _run(self):
+        while not self._stopped:
+            job = self._queue.get()
+            if job is None:
+                continue
+            generation, path, frame = job
+            if generation != self._generation or read.frameCache.contains(path, frame):
+                continue
+            try:
+                read.read(path, frame)
+            except Exception as err:
+                logging.warning("read-ahead of {} frame {} failed: {}".format(path, frame, err))
@@ -1,11 +1,12 @@
 from OpenGL.GL import *
+from editor.render.puregl import resources, indices
 import numpy as np
 
 class VBO:
     def __init__(self, data, usage=GL_STATIC_DRAW):
         assert isinstance(data, np.ndarray), "data must be an instance of np.ndarray, got: {}".format(type(data))
         # assert data.dtype == np.float32, "elements must be np.float32, got: {}".format(data.dtype)
-        self._handle = glGenBuffers(1)
+        self._handle = resources.buffers(1)
 
         #upload data
         glBindBuffer(GL_ARRAY_BUFFER, self._handle)
@@ -22,8 +23,7 @@ class VBO:
         glBindBuffer(GL_ARRAY_BUFFER, 0)
 
     def __del__(self):
-        print("delete VBO")
-        glDeleteBuffers(1, np.array([self._handle]))
+        resources.release('buffer', self._handle)
 
     def get_data(self):
         glBindBuffer(GL_ARRAY_BUFFER, self._handle)
@@ -33,13 +33,18 @@ class VBO:
 
 class EBO:
     def __init__(self, data, usage=GL_STATIC_DRAW):
-        self._handle = glGenBuffers(1)
+        self._handle = resources.buffers(1)
+        data = indices.compact(data)
 
         # upload data to GOU
         glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self._handle)
         glBufferData(GL_ELEMENT_ARRAY_BUFFER, data.nbytes, data, GL_STATIC_DRAW)
         glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
 
+        self._nbytes = data.nbytes
+        self._count = data.size
+        self._type = indices.gltype(data)
+
     def __enter__(self):
         glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self._handle)
 
@@ -47,19 +52,21 @@ class EBO:
         glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
 
     def __del__(self):
-        pass
+        resources.release('buffer', self._handle)
 
     @property
     def size(self):
         """
-        returns the size of the buffer object on the GPU, measured in bytes. 
-        The initial value is 0.
+        returns the size of the buffer object on the GPU, measured in bytes.
         """
-        assert self._handle == glGetIntegerv(GL_ELEMENT_ARRAY_BUFFER_BINDING)
-        # TODO: check perfomrance and cache item size
-        return glGetBufferParameteriv(GL_ELEMENT_ARRAY_BUFFER , GL_BUFFER_SIZE)
+        return self._nbytes
 
     @property
     def count(self):
-        # TODO: check performance and cache item size
-        return self.size//np.uint().itemsize
+        """number of indices"""
+        return self._count
+
+    @property
+    def type(self):
+        """GL type of the indices for glDrawElements, GL_UNSIGNED_SHORT or GL_UNSIGNED_INT"""
+        return self._type
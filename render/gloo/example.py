@@ -236,19 +236,19 @@ if __name__ == '__main__':
                                     with texture:
                                         shader.set_uniform("material.useDiffuseMap", True)
                                         glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
-                                        glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, None)
+                                        glDrawElements(GL_TRIANGLES, count, indexBuffer.type, None)
                                         shader.set_uniform("material.useDiffuseMap", False)
                                         glPolygonMode(GL_FRONT_AND_BACK, GL_LINE)
-                                        glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, None)
-                                        glDrawElements(GL_POINTS, count, GL_UNSIGNED_INT, None)
+                                        glDrawElements(GL_TRIANGLES, count, indexBuffer.type, None)
+                                        glDrawElements(GL_POINTS, count, indexBuffer.type, None)
                                 else:
                                     shader.set_uniform("useDiffuseMap", True)
                                     glPolygonMode(GL_FRONT_AND_BACK, GL_FILL)
-                                    glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, None)
+                                    glDrawElements(GL_TRIANGLES, count, indexBuffer.type, None)
                                     shader.set_uniform("useDiffuseMap", False)
                                     glPolygonMode(GL_FRONT_AND_BACK, GL_LINE)
-                                    glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, None)
-                                    glDrawElements(GL_POINTS, count, GL_UNSIGNED_INT, None)
+                                    glDrawElements(GL_TRIANGLES, count, indexBuffer.type, None)
+                                    glDrawElements(GL_POINTS, count, indexBuffer.type, None)
 
                 glEnable( GL_PROGRAM_POINT_SIZE )
                 with fbo:
@@ -1,10 +1,11 @@
 from OpenGL.GL import *
+from editor.render.puregl import resources
 from .texture import Texture
 
 class FBO:
     def __init__(self, width, height, slot):
         self.texture_unit = slot
-        self._handle = glGenFramebuffers(1)
+        self._handle = resources.framebuffers(1)
 
         glBindFramebuffer(GL_FRAMEBUFFER, self._handle);
         
@@ -12,7 +13,7 @@ class FBO:
         self.texture = Texture.from_size((width, height), slot)
 
         # depth buffer
-        depthrenderbuffer = glGenRenderbuffers(1)
+        self._depthrenderbuffer = depthrenderbuffer = resources.renderbuffers(1)
         glBindRenderbuffer(GL_RENDERBUFFER, depthrenderbuffer)
         glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT, width, height)
         glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, depthrenderbuffer)
@@ -46,6 +47,6 @@ class FBO:
         glBindFramebuffer(GL_FRAMEBUFFER, 0)
 
     def __del__(self):
-        pass
-        # glDeleteFrameBuffers(1, [self._handle])
+        resources.release('framebuffer', self._handle)
+        resources.release('renderbuffer', self._depthrenderbuffer)
 
@@ -78,7 +78,7 @@ def box(width=1, height=1, length=1, origin=(0,0, 0)):
         12, 13, 14,     12, 14, 15,   # bottom
         16, 17, 18,     16, 18, 19,   # right
         20, 21, 22,     20, 22, 23,   # left
-    ], dtype=np.uint).reshape((-1,3))
+    ], dtype=np.uint32).reshape((-1,3))
 
     uvs = np.array([
        # Front
@@ -151,7 +151,7 @@ def plane(width=1, length=1, origin=(0,0)):
     indices = np.array([
         0,1,2,
         0,2,3
-    ], dtype=np.uint).reshape((-1,3))
+    ], dtype=np.uint32).reshape((-1,3))
 
     uvs = np.array([
         0,  0, 
@@ -255,7 +255,7 @@ def sphere(radius=0.5, origin=(0,0.5,0)):
     return {
         'positions': positions,
         'normals': normals,
-        'indices': np.array(indices, dtype=np.uint),
+        'indices': np.array(indices, dtype=np.uint32),
         'uvs': np.array(texCoords, dtype=np.float32).reshape((-1,2)),
         'colors': np.random.uniform(0,1, (len(vertices)//3, 4) ).astype(np.float32)
     }
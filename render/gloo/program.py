@@ -1,4 +1,5 @@
 from OpenGL.GL import *
+from editor.render.puregl import resources
 import numpy as np
 import glm
 import sys;
@@ -43,7 +44,7 @@ class Program:
 			
 		# FIXME: check for a valid contex
 		# and throw an error before using gl commands
-		self.program_id = glCreateProgram()
+		self.program_id = resources.program()
 
 		try:
 			self.shader_ids = []
@@ -65,6 +66,9 @@ class Program:
 				self.shader_ids.append(shader_id)
 
 			glLinkProgram(self.program_id)
+			# flag the shaders for deletion, they go with the program
+			for shader_id in self.shader_ids:
+				glDeleteShader(shader_id)
 
 			# check if linking was successful
 			result = glGetProgramiv(self.program_id, GL_LINK_STATUS)
@@ -86,10 +90,7 @@ class Program:
 		glUseProgram(0)
 
 	def __del__(self):
-		for shader_id in self.shader_ids:
-			glDetachShader(self.program_id, shader_id)
-			glDeleteShader(shader_id)
-		glDeleteProgram(self.program_id)
+		resources.release('program', self.program_id)
 
 	def get_uniform_location(self, name):
 		location = glGetUniformLocation(self.program_id, name)
@@ -1,4 +1,5 @@
 from OpenGL.GL import *
+from editor.render.puregl import resources
 import numpy as np
 
 class Texture:
@@ -7,7 +8,7 @@ class Texture:
         slot: bind to texture unit
         """
         assert isinstance(slot, int)
-        self._handle = glGenTextures(1)
+        self._handle = resources.textures(1)
         self.texture_unit = slot
 
     @classmethod
@@ -57,4 +58,4 @@ class Texture:
         self.unbind()
 
     def __del__(self):
-        pass
\ No newline at end of file
+        resources.release('texture', self._handle)
\ No newline at end of file
@@ -1,4 +1,5 @@
 from OpenGL.GL import *
+from editor.render.puregl import resources
 import numpy as np
 import ctypes
 from .helpers import buffer_offset
@@ -15,7 +16,7 @@ class VAO:
     def __init__(self):
 
         # create VAO
-        self._handle = glGenVertexArrays(1)
+        self._handle = resources.vertex_arrays(1)
         self._enabled_vertex_attribute_locations = set()
         self._vbos = []
 
@@ -54,5 +55,5 @@ class VAO:
         # glDeleteBuffers(1, np.array([self.position_vertex_buffer], dtype=np.uint))
 
         # delete VAO
-        glDeleteVertexArrays(1, np.array([self._handle], dtype=np.uint))
+        resources.release('vertex_array', self._handle)
 
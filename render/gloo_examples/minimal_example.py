@@ -103,8 +103,8 @@ with window:
 
 			with vao, indexBuffer, texture:
 				count = indexBuffer.count
-				glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, None)
-				glDrawElements(GL_POINTS, count, GL_UNSIGNED_INT, None)
+				glDrawElements(GL_TRIANGLES, count, indexBuffer.type, None)
+				glDrawElements(GL_POINTS, count, indexBuffer.type, None)
 
 			window.swap_buffers()
 			GLFWViewer.poll_events()
\ No newline at end of file
@@ -1,30 +1,83 @@
 from pathlib import Path
+import re
 import logging
-import functools
+from editor.utils import memoize
 
-@functools.lru_cache(maxsize=128)
+GLSL_FOLDER = Path(__file__).parent
+
+# file -> files it includes directly
+dependencies = dict()
+
+_include = re.compile(r'^[ \t]*#include[ \t]+["<](.+?)[">][ \t]*$', re.M)
+
+
+def preprocess(path, included=None):
+	"""
+	source of the file with #include "file" directives resolved
+	relative to the including file, then to the glsl folder.
+	every file is included once per shader.
+	"""
+	path = Path(path).resolve()
+	if included is None:
+		included = set()
+	included.add(path)
+	direct = set()
+
+	def include(match):
+		target = (path.parent / match.group(1)).resolve()
+		if not target.exists():
+			target = (GLSL_FOLDER / match.group(1)).resolve()
+		if not target.exists():
+			raise FileNotFoundError("{} included from {}".format(match.group(1), path))
+		direct.add(target)
+		if target in included:
+			return "// {} already included".format(match.group(1))
+		return preprocess(target, included)
+
+	source = _include.sub(include, path.read_text())
+	dependencies[path] = direct
+	return source
+
+
+def dependents(path)->set:
+	"""files including path, directly or through other includes"""
+	path = Path(path).resolve()
+	result = set()
+	changed = True
+	while changed:
+		changed = False
+		for file, includes in dependencies.items():
+			if file not in result and (path in includes or includes & result):
+				result.add(file)
+				changed = True
+	return result
+
+
+def invalidate(path=None):
+	"""forget cached sources and variants after path, or any file, changed on disk"""
+	if path is None or dependents(path) or Path(path).resolve() in dependencies:
+		read.clear()
+		variant_sources.clear()
+
+
+@memoize(maxsize=128, name="glsl.read")
 def read(*args):
 	logging.debug("read {}".format(args))
-	glsl_folder = Path(__file__).parent
+	glsl_folder = GLSL_FOLDER
 	if len(args) == 1:
 		shader = args[0]
-		vertex = Path(glsl_folder, shader+'.vs').read_text()
-		fragment = Path(glsl_folder, shader+'.fs').read_text()
+		vertex = preprocess(Path(glsl_folder, shader+'.vs'))
+		fragment = preprocess(Path(glsl_folder, shader+'.fs'))
 
 		# look for optional geometry shader
 		if Path(glsl_folder, shader+'.gs').exists():
-			geometry = Path(glsl_folder, shader+'.gs').read_text()
+			geometry = preprocess(Path(glsl_folder, shader+'.gs'))
 			return vertex, fragment, geometry
 		else:
 			return vertex, fragment
-	elif len(args) == 2:
-		"""vertex and fragment shader"""
-		vertex, fragment = args
-		return Path(glsl_folder, vertex).read_text(), Path(glsl_folder, fragment).read_text()
-	elif len(args == 3):
-		"""vertex, fragment and geometry shader"""
-		vertex, fragment, geometry = args
-		return Path(glsl_folder, vertex).read_text(), Path(glsl_folder, fragment).read_text(), Path(glsl_folder, geometry).read_text()
+	elif len(args) in (2, 3):
+		"""vertex, fragment and optional geometry shader"""
+		return tuple(preprocess(Path(glsl_folder, filename)) for filename in args)
 	else:
 		raise NotImplementedError()
 
@@ -37,6 +90,25 @@ def define(shader, **defines):
 	return "\n".join(shader)
 
 
+def canonical(defines)->tuple:
+	"""defines as a sorted tuple of strings, so equal sets share one variant"""
+	return tuple(sorted((name, str(int(value)) if isinstance(value, bool) else str(value)) for name, value in defines.items()))
+
+
+def variant(*args, **defines):
+	"""
+	sources of read(*args) with the defines after the #version line.
+	the same define set returns the same strings, so puregl.program.create
+	compiles every permutation once.
+	"""
+	return variant_sources(args, canonical(defines))
+
+
+@memoize(maxsize=256, name="glsl.variant")
+def variant_sources(args, defines):
+	return tuple(define(source, **dict(defines)) for source in read(*args))
+
+
 if __name__ == "__main__":
 	shaders = read("graphics/pbrlighting")
 	shaders = [define(shader, NUM_LIGHTS=10, MAX_LIGHTS=5) for shader in shaders]
@@ -0,0 +1,6 @@
+// std140, packed by graphics.uniformblocks.CAMERA_DTYPE
+layout (std140) uniform Camera{
+	mat4 projection;
+	mat4 view;
+	vec3 cameraPos;
+};
@@ -0,0 +1,5 @@
+#version 330 core
+
+void main(){
+	// gl_FragDepth = gl_FragCoord.z;
+}
\ No newline at end of file
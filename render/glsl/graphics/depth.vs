@@ -0,0 +1,11 @@
+#version 330 core
+
+layout (location=0) in vec3 position;
+
+#include "camera.glsl"
+uniform mat4 model;
+
+void main()
+{
+	gl_Position = projection * view * model * vec4(position, 1.0);
+}
\ No newline at end of file
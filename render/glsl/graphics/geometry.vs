@@ -3,8 +3,7 @@ layout (location=0) in vec3 position;
 layout (location=1) in vec2 uv;
 layout (location=2) in vec3 normal;
 
-uniform mat4 projection;
-uniform mat4 view;
+#include "camera.glsl"
 uniform mat4 model;
 
 out vec3 Position;
@@ -0,0 +1,17 @@
+// std140, packed by graphics.uniformblocks.LIGHTS_DTYPE
+struct Light{
+	int type;
+	float cutOff;
+	float nearPlane;
+	float farPlane;
+	vec3 color;
+	int shadowIdx;
+	vec3 position;
+	vec3 direction;
+	mat4 matrix;
+};
+
+layout (std140) uniform Lights{
+	int numLights;
+	Light lights[MAX_LIGHTS];
+};
@@ -1,11 +1,22 @@
 #version 330 core
+// defaults, overridden by glsl.variant
+#ifndef MAX_LIGHTS
 #define MAX_LIGHTS 3
+#endif
+#ifndef MAX_SHADOWMAPS
 #define MAX_SHADOWMAPS 2
+#endif
+#ifndef MAX_SHADOWCUBES
 #define MAX_SHADOWCUBES 1
+#endif
+#ifndef USE_SHADOWS
+#define USE_SHADOWS 1
+#endif
+#ifndef USE_IBL
+#define USE_IBL 1
+#endif
 const float PI = 3.14159265359;
 
-uniform int numLights;
-
 uniform vec3 cameraPos;
 uniform sampler2D gPosition;
 uniform sampler2D gNormal;
@@ -17,20 +28,7 @@ uniform sampler2D gEmissive;
 in vec2 TexCoords;
 out vec4 FragColor;
 
-struct Light{
-	int type;
-	vec3 color;
-	vec3 position;
-	vec3 direction;
-	float cutOff;
-	mat4 matrix;
-	int shadowIdx;
-
-	float nearPlane;
-	float farPlane;
-};
-
-uniform Light lights[MAX_LIGHTS];
+#include "lights.glsl"
 uniform sampler2D shadowMaps[MAX_SHADOWMAPS];
 uniform samplerCube shadowCubes[MAX_SHADOWCUBES];
 uniform samplerCube irradianceMap;
@@ -144,10 +142,12 @@ void main()
 			L = normalize(-lights[i].direction);
 			attenuation=1.0;
 
+#if USE_SHADOWS
 			// calc shadow
 			vec4 fragPosLightSpace = lights[i].matrix * vec4(surfacePos, 1.0);
 			float shadow = ShadowCalculation(fragPosLightSpace, L, N, shadowMaps[lights[i].shadowIdx]);
 			attenuation*=1-shadow;
+#endif
 		}
 		else if(lights[i].type==1)
 		{
@@ -164,19 +164,23 @@ void main()
 				}
 			}
 
+#if USE_SHADOWS
 			// calc shadow
 			vec4 fragPosLightSpace = lights[i].matrix * vec4(surfacePos, 1.0);
 			float shadow = ShadowCalculation(fragPosLightSpace, L, N, shadowMaps[lights[i].shadowIdx]);
 			attenuation*=1-shadow;
+#endif
 		}
 		else if(lights[i].type==2){
 			L = normalize(lights[i].position - surfacePos);
 			float distance = length(lights[i].position - surfacePos);
 			attenuation = 1.0 / (distance*distance);
 
+#if USE_SHADOWS
 			// calc shadow
 			float shadow = PointShadowCalculation(lights[i].position, surfacePos, shadowCubes[0], lights[i].farPlane);
 			attenuation*=1-shadow;
+#endif
 		}
 		else{
 			continue;
@@ -217,6 +221,7 @@ void main()
 
 	// IBL ambient
 	// -----------
+#if USE_IBL
 	// # Diffuse component
 	vec3 F = fresnelSchlickRoughness(max(dot(N, V), 0.0), baseReflectivity, roughness);
     vec3 kS = F;
@@ -235,6 +240,9 @@ void main()
 
     // combine diffuse and specular component lighting
     vec3 ambient = (kD * diffuse + specular) * ao;
+#else
+	vec3 ambient = vec3(0.03) * albedo * ao;
+#endif
 
 	//
 	vec3 color = Lo+ambient;
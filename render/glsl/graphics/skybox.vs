@@ -0,0 +1,13 @@
+#version 330 core
+layout (location = 0) in vec3 position;
+
+out vec3 vUvw;
+
+#include "camera.glsl"
+
+void main(){
+	vUvw = position;
+	// rotation only, the sky is infinitely far
+	vec4 pos = projection * mat4(mat3(view)) * vec4(position, 1.0);
+	gl_Position = pos.xyww; // when usign glDepthFunc(GL_LEQUAL) it is visible and always farthest
+}
\ No newline at end of file
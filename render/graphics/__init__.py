@@ -6,4 +6,5 @@ from .scene import Scene
 from .cameras import PerspectiveCamera, OrthographicCamera, Camera360
 from .lights import DirectionalLight, SpotLight, PointLight
 
+from .frametimer import FrameTimer
 from .viewer import Viewer
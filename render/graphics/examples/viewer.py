@@ -4,12 +4,15 @@ import glm
 import functools
 from editor.render import puregl
 from editor.render.graphics import PerspectiveCamera
+from editor.render.graphics.frametimer import FrameTimer
 
 class Viewer:
-    def __init__(self, width=1280, height=720, title="puregl-viewer", floating=False):
+    def __init__(self, width=1280, height=720, title="puregl-viewer", floating=False, show_frame_time=False):
         self.width, self.height = width, height
         self.title = title
         self._floating = floating
+        self.frame_timer = FrameTimer()
+        self.show_frame_time = show_frame_time
 
         self.events = {'on_setup':[], 'on_draw':[]}
 
@@ -83,15 +86,28 @@ class Viewer:
             f()
 
         while not glfw.window_should_close(window):
+            self.frame_timer.begin_frame()
+            puregl.debug.begin_frame()
+            puregl.resources.collect()
             glClearColor(0,0,0,1)
             glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
             glEnable(GL_DEPTH_TEST)
 
-            for f in self.events['on_draw']:
+            for i, f in enumerate(self.events['on_draw']):
                 glViewport(0,0,self.width, self.height)
-                f()
-            glfw.swap_buffers(window)
+                # every callback is named on_draw, keep them apart
+                with self.frame_timer.measure("{}[{}]".format(f.__qualname__, i)):
+                    f()
+
+            if self.show_frame_time:
+                self.frame_timer.draw((0, 0, self.width//3, self.height//6))
+                glViewport(0,0,self.width, self.height)
+
+            with self.frame_timer.measure("swap"):
+                glfw.swap_buffers(window)
             glfw.poll_events()
+            puregl.debug.end_frame()
+            self.frame_timer.end_frame()
         glfw.terminate()
 
 
@@ -0,0 +1,81 @@
+import time
+import numpy as np
+from contextlib import contextmanager
+from editor import profiler
+
+
+class FrameTimer:
+    """
+    Ring buffer of per-frame timings in ms
+    'frame': wall time of the whole frame
+    'cpu': frame time without the buffer swap
+    any other name measured with `measure`, eg. each draw callback and 'swap'
+    """
+    def __init__(self, capacity=240):
+        self.capacity = capacity
+        self._timings = dict()  # name -> ring buffer
+        self._count = 0
+        self._frame = dict()
+        self._frame_start = None
+
+    def begin_frame(self):
+        self._frame = dict()
+        self._frame_start = time.perf_counter_ns()
+
+    @contextmanager
+    def measure(self, name):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter_ns()-start
+            self._frame[name] = self._frame.get(name, 0)+duration
+            if profiler.enabled:
+                profiler.record("frame/"+name, start, duration)
+
+    def end_frame(self):
+        if self._frame_start is None:
+            return
+        frame = time.perf_counter_ns()-self._frame_start
+        self._frame['frame'] = frame
+        self._frame['cpu'] = frame-self._frame.get('swap', 0)
+
+        i = self._count % self.capacity
+        for name in self._frame.keys() | self._timings.keys():
+            if name not in self._timings:
+                self._timings[name] = np.zeros(self.capacity, dtype=np.float32)
+            self._timings[name][i] = self._frame.get(name, 0)/1e6
+        self._count+=1
+        self._frame_start = None
+
+    @property
+    def names(self):
+        return list(self._timings.keys())
+
+    def history(self, name='frame')->np.ndarray:
+        """timings of the recorded frames, oldest first"""
+        timings = self._timings.get(name)
+        if timings is None:
+            return np.zeros(0, dtype=np.float32)
+        if self._count < self.capacity:
+            return timings[:self._count]
+        i = self._count % self.capacity
+        return np.concatenate([timings[i:], timings[:i]])
+
+    def percentiles(self, name='frame', q=(50, 95, 99))->dict:
+        history = self.history(name)
+        if not len(history):
+            return {p: 0.0 for p in q}
+        return dict(zip(q, np.percentile(history, q)))
+
+    def report(self)->str:
+        lines = ["{:<24} {:>8} {:>8} {:>8}".format("frame time (ms)", "p50", "p95", "p99")]
+        for name in sorted(self._timings):
+            p = self.percentiles(name)
+            lines.append("{:<24} {:>8.2f} {:>8.2f} {:>8.2f}".format(name, p[50], p[95], p[99]))
+        return "\n".join(lines)
+
+    def draw(self, rect, name='frame', max_ms=50.0):
+        """frame-time graph overlay, with a line at 60fps"""
+        from editor.render import imdraw
+        imdraw.graph(self.history(name), rect, max_value=max_ms, capacity=self.capacity, markers=(1000/60,))
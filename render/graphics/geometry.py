@@ -1,5 +1,21 @@
 from editor.render import puregl
 from OpenGL.GL import *
+import numpy as np
+import ctypes
+
+# interleaved vertex layout of every Geometry, in a single VBO
+VERTEX_DTYPE = np.dtype([
+    ('position', np.float32, 3),
+    ('uv', np.float32, 2),
+    ('normal', np.float32, 3)
+])
+
+
+def attribute_layout(prog)->tuple:
+    """locations of the VERTEX_DTYPE attributes in the program, -1 when not used"""
+    if isinstance(prog, puregl.program.Program):
+        return tuple(prog.attribute_location(name) for name in VERTEX_DTYPE.names)
+    return tuple(glGetAttribLocation(prog, name) for name in VERTEX_DTYPE.names)
 
 
 class Geometry:
@@ -27,72 +43,76 @@ class Geometry:
         return self._indices
 
     def _setup(self):
-        # geometry
-        positions = self.positions
-        uvs = self.uvs
-        normals = self.normals
-        indices = self.indices
-
-        # setup VAO
-        vao = glGenVertexArrays(1)
-
-        # create VBOs
-        pos_vbo, uv_vbo, norm_vbo = glGenBuffers(3)  # FIXME: use single vbo for positions and vertices
-
-        glBindBuffer(GL_ARRAY_BUFFER, pos_vbo)
-        glBufferData(GL_ARRAY_BUFFER, positions.nbytes, positions, GL_STATIC_DRAW)
-
-        glBindBuffer(GL_ARRAY_BUFFER, uv_vbo)
-        glBufferData(GL_ARRAY_BUFFER, uvs.nbytes, uvs, GL_STATIC_DRAW)
+        with puregl.resources.owner(self):
+            self._create_buffers()
+        self._needs_setup = False
 
-        glBindBuffer(GL_ARRAY_BUFFER, norm_vbo)
-        glBufferData(GL_ARRAY_BUFFER, normals.nbytes, normals, GL_STATIC_DRAW)
+    def vertices(self):
+        """positions, uvs and normals interleaved as VERTEX_DTYPE"""
+        positions = np.asarray(self.positions).reshape(-1, 3)
+        vertices = np.zeros(len(positions), dtype=VERTEX_DTYPE)
+        vertices['position'] = positions
+        vertices['uv'] = np.asarray(self.uvs).reshape(-1, 2)
+        vertices['normal'] = np.asarray(self.normals).reshape(-1, 3)
+        return vertices
+
+    def _create_buffers(self):
+        vertices = self.vertices()
+        indices = puregl.indices.compact(self.indices, len(vertices))
+
+        # create VBO, a single buffer with the interleaved attributes
+        vbo = puregl.resources.buffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, vbo)
+        glBufferData(GL_ARRAY_BUFFER, vertices.nbytes, vertices, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
 
         # create EBO
-        ebo = glGenBuffers(1)
+        ebo = puregl.resources.buffers(1)
         glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
         glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
         glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
 
         # pass to self
-        self._vao = vao
+        self._vbo = vbo
         self._ebo = ebo
-        self._vbos = pos_vbo, uv_vbo, norm_vbo
+        self._count = indices.size
+        self._index_type = puregl.indices.gltype(indices)
+        self._vaos = dict() # attribute locations -> VAO
+
+    def _create_vao(self, layout):
+        """VAO reading the interleaved buffer at the attribute locations of layout"""
+        with puregl.resources.owner(self):
+            vao = puregl.resources.vertex_arrays(1)
+        glBindVertexArray(vao)
+        glBindBuffer(GL_ARRAY_BUFFER, self._vbo)
+        for name, location in zip(VERTEX_DTYPE.names, layout):
+            if location < 0:
+                continue
+            dtype, offset = VERTEX_DTYPE.fields[name]
+            glVertexAttribPointer(location, dtype.shape[0], GL_FLOAT, False, VERTEX_DTYPE.itemsize, ctypes.c_void_p(offset))
+            glEnableVertexAttribArray(location)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self._ebo) # recorded in the VAO
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        return vao
 
-        self._needs_setup = False
+    def __del__(self):
+        if not self._needs_setup:
+            puregl.resources.release('vertex_array', *self._vaos.values())
+            puregl.resources.release('buffer', self._ebo, self._vbo)
 
     def _draw(self, prog):
         if self._needs_setup:
             self._setup()
 
-        vao = self._vao
-        ebo = self._ebo
-        pos_vbo, uv_vbo, norm_vbo = self._vbos
+        # programs with the same attribute locations share a VAO
+        layout = attribute_layout(prog)
+        vao = self._vaos.get(layout)
+        if vao is None:
+            vao = self._vaos[layout] = self._create_vao(layout)
 
-        # attach VBOs
         glBindVertexArray(vao)
-
-        position_location = glGetAttribLocation(prog, 'position')
-        glBindBuffer(GL_ARRAY_BUFFER, pos_vbo)
-        glVertexAttribPointer(position_location, 3, GL_FLOAT, False, 0, None)
-        glEnableVertexAttribArray(position_location)
-
-        uv_location = glGetAttribLocation(prog, 'uv')
-        if uv_location >= 0:
-            glBindBuffer(GL_ARRAY_BUFFER, uv_vbo)
-            glVertexAttribPointer(uv_location, 2, GL_FLOAT, False, 0, None)
-            glEnableVertexAttribArray(uv_location)
-
-        norm_location = glGetAttribLocation(prog, 'normal')
-        if norm_location >= 0:
-            glBindBuffer(GL_ARRAY_BUFFER, norm_vbo)
-            glVertexAttribPointer(norm_location, 3, GL_FLOAT, False, 0, None)
-            glEnableVertexAttribArray(norm_location)
-
-        #
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
-        glDrawElements(GL_TRIANGLES, self.indices.size, GL_UNSIGNED_INT, None)
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glDrawElements(GL_TRIANGLES, self._count, self._index_type, None)
         glBindVertexArray(0)
 
     @classmethod
@@ -4,6 +4,8 @@ from editor.render import puregl, glsl, imdraw
 
 
 class AddPass(RenderPass):
+	shaders = [("graphics/add",)]
+
 	def __init__(self, width, height):
 		super().__init__(width, height, False, GL_BACK)
 		self.program = None
@@ -13,10 +15,10 @@ class AddPass(RenderPass):
 	def setup(self):
 		super().setup()
 		# create program
-		self.program = puregl.program.create(*glsl.read("graphics/add"))
+		self.program = puregl.program.create(*glsl.read(*self.shaders[0]))
 
 		# create texture
-		self.output_texture = glGenTextures(1)
+		self.output_texture = puregl.resources.textures(1)
 		glBindTexture(GL_TEXTURE_2D, self.output_texture)
 		glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA32F, self.width, self.height, 0, GL_RGBA, GL_FLOAT, None)
 		glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
@@ -24,13 +26,13 @@ class AddPass(RenderPass):
 		glBindTexture(GL_TEXTURE_2D, 0)
 
 		# create depth+stencil buffer
-		rbo = glGenRenderbuffers(1)
+		rbo = puregl.resources.renderbuffers(1)
 		glBindRenderbuffer(GL_RENDERBUFFER, rbo)
 		glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH24_STENCIL8, self.width, self.height)
 		glBindRenderbuffer(GL_RENDERBUFFER, 0)
 
 		# create fbo
-		self.fbo = glGenFramebuffers(1)
+		self.fbo = puregl.resources.framebuffers(1)
 		with puregl.fbo.bind(self.fbo):
 			glFramebufferTexture2D(
 				GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, self.output_texture, 0
@@ -74,7 +76,7 @@ if __name__ == "__main__":
 	@viewer.event
 	def on_setup():
 		global texA
-		texA = glGenTextures(1)
+		texA = puregl.resources.textures(1)
 		glBindTexture(GL_TEXTURE_2D, texA)
 		glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB32F, imgA.shape[1], imgA.shape[0], 0, GL_RGB, GL_FLOAT, imgA)
 		glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
@@ -82,7 +84,7 @@ if __name__ == "__main__":
 		glBindTexture(GL_TEXTURE_2D, 0)
 
 		global texB
-		texB = glGenTextures(1)
+		texB = puregl.resources.textures(1)
 		glBindTexture(GL_TEXTURE_2D, texB)
 		glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB32F, imgB.shape[1], imgB.shape[0], 0, GL_RGB, GL_FLOAT, imgB)
 		glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
@@ -7,6 +7,8 @@ import numpy as np
 
 
 class CubeDepthPass(RenderPass):
+    shaders = [("point_shadow",)]
+
     def __init__(self, width, height, cull_face=GL_BACK):
         super().__init__(width, height, True, cull_face, None)
         self.texture = None
@@ -17,7 +19,7 @@ class CubeDepthPass(RenderPass):
         super().setup()
         # Create textures
         # ---------------
-        self.texture = glGenTextures(1)
+        self.texture = puregl.resources.textures(1)
 
         # define textures
         glBindTexture(GL_TEXTURE_CUBE_MAP, self.texture)
@@ -36,7 +38,7 @@ class CubeDepthPass(RenderPass):
 
         # Create fbo
         # ----------
-        self.fbo = glGenFramebuffers(1)
+        self.fbo = puregl.resources.framebuffers(1)
 
         # configure fbo
         glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
@@ -52,7 +54,7 @@ class CubeDepthPass(RenderPass):
 
         # Create program
         # --------------
-        self.program = puregl.program.create(*glsl.read("point_shadow"))
+        self.program = puregl.program.create(*glsl.read(*self.shaders[0]))
 
     def render(self, objects: [Mesh], camera: Camera360):
         super().render()
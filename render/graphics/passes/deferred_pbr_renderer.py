@@ -4,7 +4,7 @@ from editor.render.graphics.lights import SpotLight, PointLight, DirectionalLigh
 import numpy as np
 import glm
 
-from editor.render.graphics.passes import GeometryPass, EnvironmentPass
+from editor.render.graphics.passes import GeometryPass, EnvironmentPass, DepthPass, CubeDepthPass
 from editor.render.graphics.passes import IrradiancePass, PrefilterPass, BRDFPass
 from editor.render.graphics.passes import PBRLightingPass
 from editor.render.graphics.passes import AddPass, TonemappingPass, ClampPass, GaussianblurPass
@@ -15,8 +15,11 @@ from editor.render import puregl, glsl, imdraw
 
 from editor.render import assets
 from editor.render.graphics import Mesh
+from editor.render.graphics import uniformblocks
 
 class SkyboxPass(RenderPass):
+    shaders = [('graphics/skybox',)]
+
     def __init__(self, width, height):
         super().__init__(width, height, True, GL_BACK)
         self.program = None
@@ -26,10 +29,11 @@ class SkyboxPass(RenderPass):
     def setup(self):
         super().setup()
         # create program
-        self.program = puregl.program.create(*glsl.read('skybox'))
+        self.program = puregl.program.create(*glsl.read(*self.shaders[0]))
+        uniformblocks.buffer('Camera').validate(self.program)
 
         # create texture
-        self.texture = glGenTextures(1)
+        self.texture = puregl.resources.textures(1)
         glBindTexture(GL_TEXTURE_2D, self.texture)
         glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB32F, self.width, self.height, 0, GL_RGB, GL_FLOAT, None)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
@@ -37,7 +41,7 @@ class SkyboxPass(RenderPass):
         glBindTexture(GL_TEXTURE_2D, 0)
 
         # create fbo
-        self.fbo = glGenFramebuffers(1)
+        self.fbo = puregl.resources.framebuffers(1)
         with puregl.fbo.bind(self.fbo):
             glDrawBuffers(1, [GL_COLOR_ATTACHMENT0 + 0])
             glFramebufferTexture2D(
@@ -45,7 +49,7 @@ class SkyboxPass(RenderPass):
             )
 
             # create depth+stencil buffer
-            rbo = glGenRenderbuffers(1)
+            rbo = puregl.resources.renderbuffers(1)
             glBindRenderbuffer(GL_RENDERBUFFER, rbo)
             glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH24_STENCIL8, self.width, self.height)
             glBindRenderbuffer(GL_RENDERBUFFER, 0)
@@ -62,10 +66,7 @@ class SkyboxPass(RenderPass):
             glDepthMask(GL_FALSE)
             glViewport(0, 0, self.width, self.height)
             with puregl.program.use(self.program) as prog:
-                puregl.program.set_uniform(prog, 'projection', camera.projection)
-                sky_view = glm.mat4(glm.mat3(camera.view));
-                puregl.program.set_uniform(prog, 'view', sky_view)
-                puregl.program.set_uniform(prog, 'cameraPos', camera.position)
+                uniformblocks.update_camera(camera)
                 puregl.program.set_uniform(prog, 'skybox', 0)
                 puregl.program.set_uniform(prog, 'groundProjection', True)
                 glActiveTexture(GL_TEXTURE0 + 0)
@@ -78,6 +79,12 @@ class SkyboxPass(RenderPass):
 
 
 class DeferredPBRRenderer(RenderPass):
+    # every pass the renderer and the shadows of its lights use
+    shaders = [args for cls in (GeometryPass, EnvironmentPass, IrradiancePass, PrefilterPass, BRDFPass,
+                                PBRLightingPass, TonemappingPass, ClampPass, GaussianblurPass, AddPass,
+                                SkyboxPass, DepthPass, CubeDepthPass)
+                    for args in cls.shaders]
+
     def __init__(self, width, height):
         super().__init__(width, height)
 
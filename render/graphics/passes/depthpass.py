@@ -4,10 +4,13 @@ from editor.render import puregl, glsl, imdraw
 import numpy as np
 import glm
 from editor.render.graphics import Mesh
+from editor.render.graphics import uniformblocks
 from editor.render.graphics.cameras import PerspectiveCamera, OrthographicCamera
 
 
 class DepthPass(RenderPass):
+    shaders = [("graphics/depth",)]
+
     def __init__(self, width, height, cull_face=GL_BACK):
         super().__init__(width, height, True, cull_face, None)
         self.texture = None
@@ -18,7 +21,7 @@ class DepthPass(RenderPass):
         super().setup()
         # Create textures
         # ---------------
-        self.texture = glGenTextures(1)
+        self.texture = puregl.resources.textures(1)
 
         # define textures
         glBindTexture(GL_TEXTURE_2D, self.texture)
@@ -36,7 +39,7 @@ class DepthPass(RenderPass):
 
         # Create fbo
         # ----------
-        self.fbo = glGenFramebuffers(1)
+        self.fbo = puregl.resources.framebuffers(1)
 
         # configure fbo
         glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
@@ -54,7 +57,8 @@ class DepthPass(RenderPass):
 
         # Create program
         # --------------
-        self.program = puregl.program.create(*glsl.read("simple_depth"))
+        self.program = puregl.program.create(*glsl.read(*self.shaders[0]))
+        uniformblocks.buffer('Camera').validate(self.program)
 
     def render(self, objects: [Mesh], camera: (PerspectiveCamera, OrthographicCamera)):
         super().render()
@@ -65,8 +69,7 @@ class DepthPass(RenderPass):
             glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
 
             # configure shaders
-            puregl.program.set_uniform(self.program, "projection", camera.projection)
-            puregl.program.set_uniform(self.program, "view", camera.view)
+            uniformblocks.update_camera(camera)
 
             # draw scene
             for mesh in objects:
@@ -6,6 +6,8 @@ import numpy as np
 
 
 class EnvironmentPass(RenderPass):
+    shaders = [("graphics/environment",)]
+
     def __init__(self, width, height):
         super().__init__(width, height, True, GL_BACK, None)
         self.texture = None
@@ -16,7 +18,7 @@ class EnvironmentPass(RenderPass):
         super().setup()
         # Create textures
         # ---------------
-        self.texture = glGenTextures(1)
+        self.texture = puregl.resources.textures(1)
 
         # define textures
         glBindTexture(GL_TEXTURE_CUBE_MAP, self.texture)
@@ -34,14 +36,14 @@ class EnvironmentPass(RenderPass):
         glBindTexture(GL_TEXTURE_CUBE_MAP, 0)
 
         # create rbo
-        rbo = glGenRenderbuffers(1)
+        rbo = puregl.resources.renderbuffers(1)
         glBindRenderbuffer(GL_RENDERBUFFER, rbo)
         glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, self.width, self.height)
         glBindRenderbuffer(GL_RENDERBUFFER, 0)
 
         # Create fbo
         # ----------
-        self.fbo = glGenFramebuffers(1)
+        self.fbo = puregl.resources.framebuffers(1)
 
         # configure fbo
         glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
@@ -59,7 +61,7 @@ class EnvironmentPass(RenderPass):
 
         # Create program
         # --------------
-        self.program = puregl.program.create(*glsl.read("graphics/environment"))
+        self.program = puregl.program.create(*glsl.read(*self.shaders[0]))
 
     def render(self, environment, camera: Camera360):
         super().render()
@@ -116,7 +118,7 @@ if __name__ == "__main__":
     def on_setup():
         global environment_texture
         h,w,c = environment_image.shape
-        environment_texture = glGenTextures(1)
+        environment_texture = puregl.resources.textures(1)
         glBindTexture(GL_TEXTURE_2D, environment_texture)
         glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB32F, w, h, 0, GL_RGB, GL_FLOAT, environment_image)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
@@ -4,6 +4,8 @@ from editor.render import puregl, glsl, imdraw
 
 
 class GaussianblurPass(RenderPass):
+    shaders = [('gaussian',)]
+
     def __init__(self, width, height):
         super().__init__(width, height, False, GL_BACK)
         self.program = None
@@ -12,10 +14,10 @@ class GaussianblurPass(RenderPass):
 
     def setup(self):
         super().setup()
-        self.program = puregl.program.create(*glsl.read('gaussian'))
+        self.program = puregl.program.create(*glsl.read(*self.shaders[0]))
 
-        self.bloom_blur_fbos = glGenFramebuffers(2)
-        self.bloom_blur_texs = glGenTextures(2)
+        self.bloom_blur_fbos = puregl.resources.framebuffers(2)
+        self.bloom_blur_texs = puregl.resources.textures(2)
         for i in range(2):
             glBindFramebuffer(GL_FRAMEBUFFER, self.bloom_blur_fbos[i])
             glBindTexture(GL_TEXTURE_2D, self.bloom_blur_texs[i])
@@ -71,7 +73,7 @@ if __name__ == "__main__":
     @viewer.event
     def on_setup():
         global tex
-        tex = glGenTextures(1)
+        tex = puregl.resources.textures(1)
         glBindTexture(GL_TEXTURE_2D, tex)
         glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB32F, w, h, 0, GL_RGB, GL_FLOAT, img)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
@@ -4,10 +4,13 @@ from editor.render import puregl, glsl, imdraw
 import glm
 from editor.render.graphics.cameras import PerspectiveCamera, OrthographicCamera
 from editor.render.graphics import Mesh
+from editor.render.graphics import uniformblocks
 from editor.render.assets import to_linear
 import logging
 
 class GeometryPass(RenderPass):
+    shaders = [("graphics/geometry",)]
+
     def __init__(self, width, height):
         super().__init__(width, height, depth_test=True, cull_face=GL_BACK, blending=False)
 
@@ -19,7 +22,7 @@ class GeometryPass(RenderPass):
         super().setup()
         # Create textures
         # ---------------
-        self.gPosition, self.gNormal, self.gAlbedo, self.gEmission, self.gRoughness, self.gMetallic = glGenTextures(6)
+        self.gPosition, self.gNormal, self.gAlbedo, self.gEmission, self.gRoughness, self.gMetallic = puregl.resources.textures(6)
         
         # define textures
         glBindTexture(GL_TEXTURE_2D, self.gPosition)
@@ -48,7 +51,7 @@ class GeometryPass(RenderPass):
         glBindTexture(GL_TEXTURE_2D, 0)
 
         # create render buffer
-        self.gDepth = glGenTextures(1)
+        self.gDepth = puregl.resources.textures(1)
         glBindTexture(GL_TEXTURE_2D, self.gDepth)
         glTexImage2D(GL_TEXTURE_2D, 0, GL_DEPTH_COMPONENT, self.width, self.height, 0, GL_DEPTH_COMPONENT, GL_FLOAT, None)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
@@ -57,7 +60,7 @@ class GeometryPass(RenderPass):
 
         # Create fbo
         # ----------
-        self.fbo = glGenFramebuffers(1)
+        self.fbo = puregl.resources.framebuffers(1)
 
         # configure fbo
         glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
@@ -80,7 +83,8 @@ class GeometryPass(RenderPass):
 
         # Create program
         # --------------
-        self.program = puregl.program.create(*glsl.read("graphics/geometry"))
+        self.program = puregl.program.create(*glsl.read(*self.shaders[0]))
+        uniformblocks.buffer('Camera').validate(self.program)
 
     def render(self, objects: [Mesh], camera: (PerspectiveCamera, OrthographicCamera)):
         super().render()
@@ -91,8 +95,7 @@ class GeometryPass(RenderPass):
             glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
             
             # set camera
-            puregl.program.set_uniform(self.program, "projection", camera.projection)
-            puregl.program.set_uniform(self.program, "view", camera.view)
+            uniformblocks.update_camera(camera)
 
             # draw scene
             for mesh in objects:
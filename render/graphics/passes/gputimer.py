@@ -0,0 +1,100 @@
+from OpenGL.GL import *
+import time
+import functools
+import numpy as np
+from editor import profiler
+
+enabled = False
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+class GPUTimer:
+    """
+    GL_TIME_ELAPSED queries around render passes, read back without stalling
+
+    only one GL_TIME_ELAPSED query can be active, so when a pass renders other
+    passes (eg. DeferredPBRRenderer) its query is split into segments around
+    them: every pass reports its exclusive GPU time.
+    results are polled at the end of each pass, usually a frame or two later,
+    and recorded in the profiler as "gpu/<pass>".
+    """
+    def __init__(self):
+        self._free = []     # query objects ready for reuse
+        self._stack = []    # [pass, name, cpu start, queries] of passes in progress
+        self._pending = []  # finished passes waiting for their results
+        self.results = dict() # name -> last GPU time in ms
+
+    def _gen_query(self):
+        if self._free:
+            return self._free.pop()
+        return int(np.atleast_1d(glGenQueries(1))[0])
+
+    def _begin_segment(self, entry):
+        query = self._gen_query()
+        glBeginQuery(GL_TIME_ELAPSED, query)
+        entry[3].append(query)
+
+    def is_active(self, renderpass):
+        return bool(self._stack) and self._stack[-1][0] is renderpass
+
+    def begin(self, renderpass, name):
+        if self._stack:
+            glEndQuery(GL_TIME_ELAPSED)
+        entry = [renderpass, name, time.perf_counter_ns(), []]
+        self._stack.append(entry)
+        self._begin_segment(entry)
+
+    def end(self):
+        glEndQuery(GL_TIME_ELAPSED)
+        entry = self._stack.pop()
+        entry[0] = None # dont keep the pass alive until the results arrive
+        self._pending.append(entry)
+        if self._stack:
+            self._begin_segment(self._stack[-1])
+        self.poll()
+
+    def poll(self):
+        """collect finished results, queries complete in submission order"""
+        while self._pending:
+            renderpass, name, start, queries = self._pending[0]
+            if not glGetQueryObjectiv(queries[-1], GL_QUERY_RESULT_AVAILABLE):
+                break
+            self._pending.pop(0)
+            elapsed = sum(int(glGetQueryObjectui64v(query, GL_QUERY_RESULT)) for query in queries)
+            self._free.extend(queries)
+            self.results[name] = elapsed/1e6
+            profiler.record("gpu/"+name, start, elapsed)
+
+    def delete(self):
+        queries = self._free+[query for entry in self._pending+self._stack for query in entry[3]]
+        if queries:
+            glDeleteQueries(len(queries), queries)
+        self._free, self._pending, self._stack = [], [], []
+
+
+# one per GL context, passes render on the context's thread
+timer = GPUTimer()
+
+
+def timed(render):
+    """wrap RenderPass.render of a subclass in a GPU timer query while enabled"""
+    @functools.wraps(render)
+    def wrapper(self, *args, **kwargs):
+        if not enabled or timer.is_active(self):
+            # disabled, or super().render() of a pass that is timed already
+            return render(self, *args, **kwargs)
+        timer.begin(self, type(self).__name__)
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            timer.end()
+    return wrapper
@@ -9,6 +9,8 @@ import glm
 
 
 class IrradiancePass(RenderPass):
+    shaders = [('cubemap.vs', 'irradiance_convolution.fs')]
+
     def __init__(self, width, height):
         super().__init__(width, height, seamless_cubemap=True)
 
@@ -20,7 +22,7 @@ class IrradiancePass(RenderPass):
         super().setup()
         # Create textures
         # ---------------
-        self.irradiance = glGenTextures(1)
+        self.irradiance = puregl.resources.textures(1)
         glBindTexture(GL_TEXTURE_CUBE_MAP, self.irradiance)
         for i in range(6):
             glTexImage2D(GL_TEXTURE_CUBE_MAP_POSITIVE_X + i, 0, GL_RGB32F, self.width, self.height, 0, GL_RGB, GL_FLOAT, None)
@@ -34,21 +36,21 @@ class IrradiancePass(RenderPass):
         glBindTexture(GL_TEXTURE_CUBE_MAP, 0)
 
         # create rbo
-        rbo = glGenRenderbuffers(1)
+        rbo = puregl.resources.renderbuffers(1)
         glBindRenderbuffer(GL_RENDERBUFFER, rbo)
         glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, self.width, self.height)
         glBindRenderbuffer(GL_RENDERBUFFER, 0)
 
         # Create fbo
         # ----------
-        self.fbo = glGenFramebuffers(1)
+        self.fbo = puregl.resources.framebuffers(1)
         with puregl.fbo.bind(self.fbo):
             glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, rbo)
         
 
         # Create program
         # --------------
-        self.program = puregl.program.create(*glsl.read('cubemap.vs', 'irradiance_convolution.fs'))
+        self.program = puregl.program.create(*glsl.read(*self.shaders[0]))
 
 
     def render(self, environment, camera: Camera360):
@@ -72,6 +74,8 @@ class IrradiancePass(RenderPass):
 
 
 class PrefilterPass(RenderPass):
+    shaders = [('cubemap.vs', 'prefilter.fs')]
+
     def __init__(self, width, height):
         super().__init__(width, height, seamless_cubemap=True)
 
@@ -83,10 +87,10 @@ class PrefilterPass(RenderPass):
     def setup(self):
         super().setup()
         # create shader
-        self.program = puregl.program.create(*glsl.read('cubemap.vs', 'prefilter.fs'))
+        self.program = puregl.program.create(*glsl.read(*self.shaders[0]))
 
         # create texture
-        self.prefilter = glGenTextures(1)
+        self.prefilter = puregl.resources.textures(1)
         glBindTexture(GL_TEXTURE_CUBE_MAP, self.prefilter)
         for i in range(6):
             glTexImage2D(GL_TEXTURE_CUBE_MAP_POSITIVE_X + i, 0, GL_RGB32F, 128, 128, 0, GL_RGB, GL_FLOAT, None)
@@ -102,13 +106,13 @@ class PrefilterPass(RenderPass):
         glBindTexture(GL_TEXTURE_CUBE_MAP, 0)
 
         # create rbo
-        self.rbo = glGenRenderbuffers(1)
+        self.rbo = puregl.resources.renderbuffers(1)
         glBindRenderbuffer(GL_RENDERBUFFER, self.rbo)
         glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH_COMPONENT24, self.width, self.height)
         glBindRenderbuffer(GL_RENDERBUFFER, 0)
 
         # create fbo
-        self.fbo = glGenFramebuffers(1)
+        self.fbo = puregl.resources.framebuffers(1)
         # attach depth buffer
         with puregl.fbo.bind(self.fbo):
             glFramebufferRenderbuffer(GL_FRAMEBUFFER, GL_DEPTH_ATTACHMENT, GL_RENDERBUFFER, self.rbo)
@@ -147,6 +151,8 @@ class PrefilterPass(RenderPass):
 
 
 class BRDFPass(RenderPass):
+    shaders = [('brdf',)]
+
     """
     Generate a 2D LUT from the BRDF equations used
     """
@@ -159,10 +165,10 @@ class BRDFPass(RenderPass):
     def setup(self):
         super().setup()
         # Create Shader
-        self.program = puregl.program.create(*glsl.read('brdf'))
+        self.program = puregl.program.create(*glsl.read(*self.shaders[0]))
         
         # Create textures
-        self.brdflut = glGenTextures(1)
+        self.brdflut = puregl.resources.textures(1)
         # pre-allocate enough memory for the LUT texture.
         glBindTexture(GL_TEXTURE_2D, self.brdflut)
         glTexImage2D(GL_TEXTURE_2D, 0, GL_RG16F, self.width, self.height, 0, GL_RG, GL_FLOAT, None);
@@ -173,7 +179,7 @@ class BRDFPass(RenderPass):
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
 
         # create fbo
-        self.fbo = glGenFramebuffers(1)
+        self.fbo = puregl.resources.framebuffers(1)
 
         with puregl.fbo.bind(self.fbo):
             glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, self.brdflut, 0)
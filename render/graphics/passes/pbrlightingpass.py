@@ -8,29 +8,45 @@ from editor.render.graphics.cameras import Camera360
 import numpy as np
 from editor.render.graphics.lights import PointLight, DirectionalLight, SpotLight
 from editor.render.assets import to_linear
+from editor.render.graphics import uniformblocks
 
 
 class PBRLightingPass(RenderPass):
+    # every permutation of the lighting shader, the cheapest one is picked per frame
+    shaders = [("graphics/pbrlighting", dict(MAX_LIGHTS=uniformblocks.MAX_LIGHTS, USE_SHADOWS=shadows, USE_IBL=ibl))
+               for shadows in (0, 1) for ibl in (0, 1)]
+
     def __init__(self, width, height):
         super().__init__(width, height, seamless_cubemap=True)
         self.texture = None
         self.fbo = None
         self.program = None
+        self._configured = set()
+
+    def variant(self, shadows, ibl):
+        """the lighting program with shadows and image based lighting compiled in or out"""
+        program = puregl.program.create(*glsl.variant("graphics/pbrlighting",
+                                                      MAX_LIGHTS=uniformblocks.MAX_LIGHTS,
+                                                      USE_SHADOWS=int(shadows),
+                                                      USE_IBL=int(ibl)))
+        if program not in self._configured:
+            uniformblocks.buffer('Lights').validate(program)
+            with puregl.program.use(program):
+                puregl.program.set_uniform(program, "projectionMatrix", np.eye(4))
+                puregl.program.set_uniform(program, "viewMatrix", np.eye(4))
+                puregl.program.set_uniform(program, "modelMatrix", np.eye(4))
+            self._configured.add(program)
+        return program
 
     def setup(self):
         super().setup()
         # create program
         # --------------
-        self.program = puregl.program.create(*glsl.read("graphics/pbrlighting"))
-
-        with puregl.program.use(self.program):
-            puregl.program.set_uniform(self.program, "projectionMatrix", np.eye(4))
-            puregl.program.set_uniform(self.program, "viewMatrix", np.eye(4))
-            puregl.program.set_uniform(self.program, "modelMatrix", np.eye(4))
+        self.program = self.variant(shadows=True, ibl=True)
 
         # create textures
         # ---------------
-        self.texture = glGenTextures(1)
+        self.texture = puregl.resources.textures(1)
         glBindTexture(GL_TEXTURE_2D, self.texture)
         glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA32F, self.width, self.height, 0, GL_RGBA, GL_FLOAT, None)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
@@ -39,7 +55,7 @@ class PBRLightingPass(RenderPass):
 
         # create fbo
         # ----------
-        self.fbo = glGenFramebuffers(1)
+        self.fbo = puregl.resources.framebuffers(1)
         glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
         glDrawBuffers(1, [GL_COLOR_ATTACHMENT0+0])
         glBindTexture(GL_TEXTURE_2D, self.texture)
@@ -49,7 +65,7 @@ class PBRLightingPass(RenderPass):
         glBindTexture(GL_TEXTURE_2D, 0)
 
         # create depth+stencil buffertarget, pname, param
-        rbo = glGenRenderbuffers(1)
+        rbo = puregl.resources.renderbuffers(1)
         glBindRenderbuffer(GL_RENDERBUFFER, rbo)
         glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH24_STENCIL8, self.width, self.height)
         glBindRenderbuffer(GL_RENDERBUFFER, 0)
@@ -61,6 +77,8 @@ class PBRLightingPass(RenderPass):
     def render(self, cameraPos, lights, gBuffer, irradiance, prefilter, brdf):
         super().render()
         gPosition, gNormal, gAlbedo, gEmissive, gRoughness, gMetallic = gBuffer
+        ibl = irradiance is not None and prefilter is not None and brdf is not None
+        self.program = self.variant(shadows=len(lights)>0, ibl=ibl)
         with puregl.fbo.bind(self.fbo), puregl.program.use(self.program):
             # clear fbo
             glViewport(0,0, self.width, self.height)
@@ -68,7 +86,6 @@ class PBRLightingPass(RenderPass):
             glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
 
             # configure shader
-            puregl.program.set_uniform(self.program, "numLights", len(lights))
             puregl.program.set_uniform(self.program, "cameraPos", cameraPos)
             
             glActiveTexture(GL_TEXTURE0+0)
@@ -95,60 +112,64 @@ class PBRLightingPass(RenderPass):
             glBindTexture(GL_TEXTURE_2D, gEmissive)
             puregl.program.set_uniform(self.program, "gEmissive", 5)
 
-            glActiveTexture(GL_TEXTURE0+6)
-            glBindTexture(GL_TEXTURE_CUBE_MAP, irradiance)
-            puregl.program.set_uniform(self.program, "irradianceMap", 6)
+            if ibl:
+                glActiveTexture(GL_TEXTURE0+6)
+                glBindTexture(GL_TEXTURE_CUBE_MAP, irradiance)
+                puregl.program.set_uniform(self.program, "irradianceMap", 6)
 
-            glActiveTexture(GL_TEXTURE0+7)
-            glBindTexture(GL_TEXTURE_CUBE_MAP, prefilter)
-            puregl.program.set_uniform(self.program, "prefilterMap", 7)
+                glActiveTexture(GL_TEXTURE0+7)
+                glBindTexture(GL_TEXTURE_CUBE_MAP, prefilter)
+                puregl.program.set_uniform(self.program, "prefilterMap", 7)
 
-            glActiveTexture(GL_TEXTURE0+8)
-            glBindTexture(GL_TEXTURE_2D, brdf)
-            puregl.program.set_uniform(self.program, "brdfLUT", 8)
+                glActiveTexture(GL_TEXTURE0+8)
+                glBindTexture(GL_TEXTURE_2D, brdf)
+                puregl.program.set_uniform(self.program, "brdfLUT", 8)
 
+            # pack lights into the Lights block
+            ubo = uniformblocks.buffer('Lights')
+            data = ubo.data
+            lights = lights[:uniformblocks.MAX_LIGHTS]
+            data['numLights'] = len(lights)
             shadowMapIdx, shadowCubeIdx = 0, 0
             for i, light in enumerate(lights):
                 slot = 9+i
+                packed = data['lights'][i]
+                packed['color'] = to_linear(light.color)*light.intensity
                 if isinstance(light, DirectionalLight):
-                    puregl.program.set_uniform(self.program, "lights[{}].type".format(i), 0)
-                    puregl.program.set_uniform(self.program, "lights[{}].color".format(i), to_linear(light.color)*light.intensity)
+                    packed['type'] = 0
+                    packed['direction'] = light.direction
+                    packed['shadowIdx'] = shadowMapIdx
+                    packed['matrix'] = np.array(light.camera.projection * light.camera.view)
 
-                    puregl.program.set_uniform(self.program, "lights[{}].direction".format(i), light.direction)
-                    puregl.program.set_uniform(self.program, "lights[{}].shadowIdx".format(i), shadowMapIdx)
-                    
                     glActiveTexture(GL_TEXTURE0+slot)
                     glBindTexture(GL_TEXTURE_2D, light.shadowmap.texture)
-                    puregl.program.set_uniform(self.program, "lights[{}].matrix".format(i), light.camera.projection * light.camera.view)
                     puregl.program.set_uniform(self.program, "shadowMaps[{}]".format(shadowMapIdx), slot)
                     shadowMapIdx += 1
 
                 elif isinstance(light, SpotLight):
-                    puregl.program.set_uniform(self.program, "lights[{}].type".format(i), 1)
-                    puregl.program.set_uniform(self.program, "lights[{}].color".format(i), to_linear(light.color)*light.intensity)
-
-                    puregl.program.set_uniform(self.program, "lights[{}].position".format(i), light.position)
-                    puregl.program.set_uniform(self.program, "lights[{}].direction".format(i), light.direction)
-                    puregl.program.set_uniform(self.program, "lights[{}].cutOff".format(i), light.cut_off)
+                    packed['type'] = 1
+                    packed['position'] = light.position
+                    packed['direction'] = light.direction
+                    packed['cutOff'] = light.cut_off
+                    packed['matrix'] = np.array(light.camera.projection * light.camera.view)
+                    packed['shadowIdx'] = shadowMapIdx
 
                     glActiveTexture(GL_TEXTURE0+slot)
                     glBindTexture(GL_TEXTURE_2D, light.shadowmap.texture)
-                    puregl.program.set_uniform(self.program, "lights[{}].matrix".format(i), light.camera.projection * light.camera.view)
-                    puregl.program.set_uniform(self.program, "lights[{}].shadowIdx".format(i), shadowMapIdx)
                     puregl.program.set_uniform(self.program, "shadowMaps[{}]".format(shadowMapIdx), slot)
                     shadowMapIdx += 1
 
                 elif isinstance(light, PointLight):
-                    puregl.program.set_uniform(self.program, "lights[{}].type".format(i), 2)
-                    puregl.program.set_uniform(self.program, "lights[{}].color".format(i), to_linear(light.color)*light.intensity)
-                    puregl.program.set_uniform(self.program, "lights[{}].position".format(i), light.position)
+                    packed['type'] = 2
+                    packed['position'] = light.position
+                    packed['farPlane'] = light.far
+                    packed['shadowIdx'] = shadowCubeIdx
 
                     glActiveTexture(GL_TEXTURE0+slot)
                     glBindTexture(GL_TEXTURE_CUBE_MAP, light.shadowmap.texture)
-                    puregl.program.set_uniform(self.program, "lights[{}].farPlane".format(i), float(light.far))
-                    puregl.program.set_uniform(self.program, "lights[{}].shadowIdx".format(i), shadowCubeIdx)
                     puregl.program.set_uniform(self.program, "shadowCubes[{}]".format(shadowCubeIdx), slot)
                     shadowCubeIdx += 1
+            ubo.upload()
 
             # draw
             imdraw.quad(self.program)
@@ -215,7 +236,7 @@ if __name__ == "__main__":
     @viewer.event
     def on_setup():
         global environment_texture
-        environment_texture = glGenTextures(1)
+        environment_texture = puregl.resources.textures(1)
         glBindTexture(GL_TEXTURE_2D, environment_texture)
         glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB32F, environment_image.shape[1], environment_image.shape[0], 
             0, GL_RGB, GL_FLOAT, environment_image)
@@ -1,6 +1,17 @@
 from OpenGL.GL import *
 import numpy as np
 import logging
+import functools
+from editor.render import puregl, glsl
+from . import gputimer
+
+
+def _owned(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with puregl.resources.owner(self):
+            return method(self, *args, **kwargs)
+    return wrapper
 
 
 class RenderPass:
@@ -10,7 +21,22 @@ class RenderPass:
     depth_test
     cull_face
     blending
+
+    while gputimer is enabled, the render of every subclass is timed on the GPU
+    and reported to the profiler as "gpu/<ClassName>".
+    GL objects created in setup and render are owned by the pass in puregl.resources
+    shaders: glsl.read arguments of the programs the pass uses, compiled ahead by warmup().
+             a trailing dict selects a glsl.variant with those defines
     """
+    shaders = []
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'setup' in cls.__dict__:
+            cls.setup = _owned(cls.setup)
+        if 'render' in cls.__dict__:
+            cls.render = gputimer.timed(_owned(cls.render))
+
     def __init__(self, width, height, depth_test=False, cull_face=False, blending=False, seamless_cubemap=False):
         # properties
         self.width = width
@@ -42,7 +68,7 @@ class RenderPass:
         glinternalformat, glformat, gltype = format_from_data(data)
 
         # create texture
-        tex = glGenTextures(1)
+        tex = puregl.resources.textures(1)
 
         # upload data
         glBindTexture(GL_TEXTURE_2D, tex)
@@ -64,6 +90,16 @@ class RenderPass:
 
         return tex
 
+    @classmethod
+    def programs(cls):
+        """sources of the programs the pass needs"""
+        return [glsl.variant(*args[:-1], **args[-1]) if isinstance(args[-1], dict) else glsl.read(*args) for args in cls.shaders]
+
+    @classmethod
+    def warmup(cls)->puregl.warmup.Warmup:
+        """compile the programs before the first render, poll() it once per frame"""
+        return puregl.warmup.Warmup(cls.programs())
+
     def setup(self):
         logging.debug("setup {}".format(self.__class__.__name__))
         self._needs_setup = False
@@ -37,7 +37,7 @@ class TemplatePass(RenderPass):
 
         # create texture(s)
         # ----------------
-        self.texture = glGenTextures(1)
+        self.texture = puregl.resources.textures(1)
         glBindTexture(GL_TEXTURE_2D, self.texture)
         glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA32F, self.width, self.height, 0, GL_RGBA, GL_FLOAT, None)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
@@ -46,7 +46,7 @@ class TemplatePass(RenderPass):
 
         # create fbo
         # ----------
-        self.fbo = glGenFramebuffers(1)
+        self.fbo = puregl.resources.framebuffers(1)
         glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
         glDrawBuffers(1, [GL_COLOR_ATTACHMENT0+0])
         glBindTexture(GL_TEXTURE_2D, self.texture)
@@ -56,7 +56,7 @@ class TemplatePass(RenderPass):
         glBindTexture(GL_TEXTURE_2D, 0)
 
         # create render buffers for depth and stencil
-        rbo = glGenRenderbuffers(1)
+        rbo = puregl.resources.renderbuffers(1)
         glBindRenderbuffer(GL_RENDERBUFFER, rbo)
         glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH24_STENCIL8, self.width, self.height)
         glBindRenderbuffer(GL_RENDERBUFFER, 0)
@@ -1,8 +1,10 @@
 from editor.render.graphics.passes import RenderPass
 from OpenGL.GL import *
-from editor.render import puregl, imdraw
+from editor.render import puregl, imdraw, glsl
 
 class TonemappingPass(RenderPass):
+    shaders = [("graphics/tonemapping",)]
+
     def __init__(self, width, height):
         super().__init__(width, height, False, GL_BACK)
         self.program = None
@@ -12,47 +14,10 @@ class TonemappingPass(RenderPass):
     def setup(self):
         super().setup()
         # create program
-        self.program = puregl.program.create(
-            """#version 330 core
-			out vec2 TexCoords;
-
-			layout (location = 0) in vec3 position;
-			layout (location = 1) in vec2 uv;
-			layout (location = 2) in vec3 normal;
-
-			void main(){
-			    TexCoords = uv;
-			    gl_Position = vec4(position.xy, 0.0, 1.0);
-			}
-			""",
-            """#version 330 core
-			out vec4 FragColor;
-			in vec2 TexCoords;
-			uniform sampler2D screenTexture;
-			uniform sampler2D bloomBlur;
-			uniform float exposure;
-			uniform float gamma=2.2;
-
-			void main(){
-			    vec3 hdrColor = texture(screenTexture, TexCoords).rgb;
-			    vec3 bloomColor = texture(bloomBlur, TexCoords).rgb;
-			    vec3 color=hdrColor+bloomColor;
-			    
-			    // reinhardt tonemapping
-			    // color = hdrColor / (hdrColor+vec3(1.0));
-
-			    // exposure tone mapping
-			    color = vec3(1.0) - exp(-hdrColor * pow(2, exposure)); // FIXME: use f-stop, shutterspeed, aperturesize
-
-			    // gamma correction
-			    color = pow(color, vec3(1.0 / gamma));  
-
-			    FragColor = vec4(color, 1.0);
-			}
-			""")
+        self.program = puregl.program.create(*glsl.read(*self.shaders[0]))
 
         # create texture
-        self.texture = glGenTextures(1)
+        self.texture = puregl.resources.textures(1)
         glBindTexture(GL_TEXTURE_2D, self.texture)
         glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA32F, self.width, self.height, 0, GL_RGBA, GL_FLOAT, None)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
@@ -60,13 +25,13 @@ class TonemappingPass(RenderPass):
         glBindTexture(GL_TEXTURE_2D, 0)
 
         # create depth+stencil buffer
-        rbo = glGenRenderbuffers(1)
+        rbo = puregl.resources.renderbuffers(1)
         glBindRenderbuffer(GL_RENDERBUFFER, rbo)
         glRenderbufferStorage(GL_RENDERBUFFER, GL_DEPTH24_STENCIL8, self.width, self.height)
         glBindRenderbuffer(GL_RENDERBUFFER, 0)
 
         # create fbo
-        self.fbo = glGenFramebuffers(1)
+        self.fbo = puregl.resources.framebuffers(1)
         with puregl.fbo.bind(self.fbo):
             glFramebufferTexture2D(
                 GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, self.texture, 0
@@ -108,7 +73,7 @@ if __name__ == "__main__":
     def on_setup():
         global tex
         
-        tex = glGenTextures(1)
+        tex = puregl.resources.textures(1)
         glBindTexture(GL_TEXTURE_2D, tex)
         glTexImage2D(GL_TEXTURE_2D, 0, GL_RGB32F, h, w, 0, GL_RGB, GL_FLOAT, img)
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
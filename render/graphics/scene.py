@@ -125,7 +125,7 @@ class Scene:
                 print(transform)
                 # geometry
                 geometry = Geometry(positions = trigeo.vertices.astype(np.float32),
-                            indices =   trigeo.faces.astype(np.uint),
+                            indices =   trigeo.faces.astype(np.uint32),
                             normals =   trigeo.vertex_normals.astype(np.float32),
                             uvs =       trigeo.visual.uv.astype(np.float32))
 
@@ -0,0 +1,48 @@
+import numpy as np
+import glm
+from editor.render import puregl
+
+# std140 layouts of the uniform blocks declared in glsl/graphics
+
+CAMERA_DTYPE = np.dtype({
+    'names': ['projection', 'view', 'cameraPos'],
+    'formats': [(np.float32, (4,4)), (np.float32, (4,4)), (np.float32, 3)],
+    'offsets': [0, 64, 128],
+    'itemsize': 144
+})
+
+# must match MAX_LIGHTS in glsl/graphics/pbrlighting.fs
+MAX_LIGHTS = 3
+
+LIGHT_DTYPE = np.dtype({
+    'names': ['type', 'cutOff', 'nearPlane', 'farPlane', 'color', 'shadowIdx', 'position', 'direction', 'matrix'],
+    'formats': [np.int32, np.float32, np.float32, np.float32, (np.float32, 3), np.int32, (np.float32, 3), (np.float32, 3), (np.float32, (4,4))],
+    'offsets': [0, 4, 8, 12, 16, 28, 32, 48, 64],
+    'itemsize': 128
+})
+
+LIGHTS_DTYPE = np.dtype({
+    'names': ['numLights', 'lights'],
+    'formats': [np.int32, (LIGHT_DTYPE, MAX_LIGHTS)],
+    'offsets': [0, 16],
+    'itemsize': 16+LIGHT_DTYPE.itemsize*MAX_LIGHTS
+})
+
+
+_buffers = dict()
+def buffer(block)->puregl.ubo.UniformBuffer:
+    """the uniform buffer bound to the block, created on first use in the current context"""
+    if block not in _buffers:
+        dtype = {'Camera': CAMERA_DTYPE, 'Lights': LIGHTS_DTYPE}[block]
+        with puregl.resources.owner("uniformblocks"):
+            _buffers[block] = puregl.ubo.UniformBuffer(block, dtype)
+    return _buffers[block]
+
+
+def update_camera(camera):
+    """projection, view and position of the camera for every program declaring the Camera block"""
+    ubo = buffer('Camera')
+    ubo.data['projection'] = np.array(camera.projection)
+    ubo.data['view'] = np.array(camera.view)
+    ubo.data['cameraPos'] = camera.position
+    ubo.upload()
@@ -7,11 +7,12 @@ import functools
 from threading import Thread
 import logging
 from editor.render.graphics import PerspectiveCamera
+from editor.render.graphics.frametimer import FrameTimer
 logging.basicConfig(filename=None, level=logging.DEBUG, format='%(levelname)s:%(module)s.%(funcName)s: %(message)s')
 
 
 class Viewer:
-    def __init__(self, scene, width=1280, height=720, title="Viewer", floating=False, background_color=(0,0,0,1)):
+    def __init__(self, scene, width=1280, height=720, title="Viewer", floating=False, background_color=(0,0,0,1), show_frame_time=False):
         # window
         self.width = width
         self.height = height
@@ -20,6 +21,10 @@ class Viewer:
         self._floating = floating
         self.background_color = background_color
 
+        # telemetry
+        self.frame_timer = FrameTimer()
+        self.show_frame_time = show_frame_time
+
         # threading
         self.thread = None
         self.lock = None
@@ -29,6 +34,7 @@ class Viewer:
         self.camera = PerspectiveCamera(glm.mat4(1), glm.radians(39.6), self.width/self.height, 0.1, 30)
         self.camera.transform = glm.inverse(glm.lookAt(glm.vec3(2, 3, 6), glm.vec3(0, 0, 0), glm.vec3(0, 1, 0)))
         self.renderer = DeferredPBRRenderer(self.width, self.height)
+        self.warmup = None
 
     def create_window(self):
         # Create window
@@ -100,21 +106,37 @@ class Viewer:
         
         # main loop
         while not glfw.window_should_close(self._handle):
+            self.frame_timer.begin_frame()
+            puregl.debug.begin_frame()
+            puregl.resources.collect()
             glClearColor(*self.background_color)
             glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
             glEnable(GL_DEPTH_TEST)
 
             if self.lock:
-                with self.lock:
+                with self.lock, self.frame_timer.measure("draw"):
                     self.draw()
             else:
-                self.draw()
+                with self.frame_timer.measure("draw"):
+                    self.draw()
+
+                if self.show_frame_time:
+                    self.frame_timer.draw((0, 0, self.width//3, self.height//6))
+                    glViewport(0, 0, self.width, self.height)
 
-                glfw.swap_buffers(self._handle)
+                with self.frame_timer.measure("swap"):
+                    glfw.swap_buffers(self._handle)
                 glfw.poll_events()
+            puregl.debug.end_frame()
+            self.frame_timer.end_frame()
         glfw.terminate()
 
     def draw(self):
+        # compile the programs before the first frame, polled so the loop keeps running
+        if self.warmup is None:
+            self.warmup = self.renderer.warmup()
+        if not self.warmup.poll():
+            return
 
         # Draw
         # ----
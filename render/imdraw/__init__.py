@@ -11,6 +11,7 @@ from .texture import texture
 from .cubemap import cubemap
 from .grid import grid
 from .axis import axis
+from .graph import graph
 
 # Paint
 from .paint import paint
\ No newline at end of file
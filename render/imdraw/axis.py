@@ -1,4 +1,5 @@
 from OpenGL.GL import *
+from editor.render.puregl import resources
 from editor.render.puregl import program
 import numpy as np
 
@@ -35,13 +36,13 @@ def axis(projection, view):
         (0, 1, 0), (0, 1, 0),
         (0, 0, 1), (0, 0, 1)
     ]).astype(np.float32)
-    pos_vbo, col_vbo = glGenBuffers(2)
+    pos_vbo, col_vbo = resources.buffers(2)
     glBindBuffer(GL_ARRAY_BUFFER, pos_vbo)
     glBufferData(GL_ARRAY_BUFFER, positions.nbytes, positions, GL_STATIC_DRAW)
     glBindBuffer(GL_ARRAY_BUFFER, col_vbo)
     glBufferData(GL_ARRAY_BUFFER, colors.nbytes, colors, GL_STATIC_DRAW)
 
-    vao = glGenVertexArrays(1)
+    vao = resources.vertex_arrays(1)
     glBindVertexArray(vao)
     glBindBuffer(GL_ARRAY_BUFFER, pos_vbo)
     glVertexAttribPointer(0, 3, GL_FLOAT, False, 0, None)
@@ -1,4 +1,6 @@
 from OpenGL.GL import *
+from editor.render.puregl import resources
+from editor.render.puregl import indices as puregl_indices
 import numpy as np
 from .helpers import buffer_offset
 import logging
@@ -16,9 +18,9 @@ def cube_buffer(locations, flip=False):
     count = indices.size
 
     # setup VAO
-    vao = glGenVertexArrays(1)
+    vao = resources.vertex_arrays(1)
     
-    pos_vbo, uv_vbo, normal_vbo = glGenBuffers(3)  # FIXME: use single vbo for positions and vertices
+    pos_vbo, uv_vbo, normal_vbo = resources.buffers(3)  # FIXME: use single vbo for positions and vertices
     glBindVertexArray(vao)
     glBindBuffer(GL_ARRAY_BUFFER, pos_vbo)
     glBufferData(GL_ARRAY_BUFFER, positions.nbytes, positions, GL_STATIC_DRAW)
@@ -46,21 +48,22 @@ def cube_buffer(locations, flip=False):
     glBindVertexArray(0)
 
     # create ebo
-    ebo = glGenBuffers(1)
+    indices = puregl_indices.compact(indices, len(positions))
+    ebo = resources.buffers(1)
     glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
     glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
     glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
 
-    return vao, ebo, count
+    return vao, ebo, count, puregl_indices.gltype(indices)
 
 
 def cube(program, flip=False):
     locations = tuple(glGetAttribLocation(program, name) for name in ("position", 'uv', 'normal'))
-    vao, ebo, count = cube_buffer(locations, flip=flip)
+    vao, ebo, count, index_type = cube_buffer(locations, flip=flip)
 
     # draw
     glBindVertexArray(vao)
     glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
-    glDrawElements(GL_TRIANGLES, 6*6, GL_UNSIGNED_INT, None)
+    glDrawElements(GL_TRIANGLES, count, index_type, None)
     glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
     glBindVertexArray(0)
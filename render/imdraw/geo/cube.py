@@ -99,7 +99,7 @@ def cube(flip=False):
         12, 13, 14, 12, 14, 15,  # bottom
         16, 17, 18, 16, 18, 19,  # right
         20, 21, 22, 20, 22, 23,  # left
-    ], dtype=np.uint).reshape((-1, 3))
+    ], dtype=np.uint32).reshape((-1, 3))
 
     if flip:
         indices = np.flip(indices)
@@ -34,6 +34,6 @@ def plane():
 
     indices = np.array([
         (0, 1, 2), (1, 3, 2)
-    ], dtype=np.uint).reshape((-1, 3))
+    ], dtype=np.uint32).reshape((-1, 3))
 
     return positions, normals, uvs, indices
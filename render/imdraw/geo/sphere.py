@@ -84,5 +84,5 @@ def sphere():
     normals = positions / magnitudes
     positions -= origin
     uvs = np.array(texCoords, dtype=np.float32).reshape((-1, 2))
-    indices = np.array(indices, dtype=np.uint)
+    indices = np.array(indices, dtype=np.uint32)
     return positions, normals, uvs, indices
\ No newline at end of file
@@ -0,0 +1,67 @@
+from OpenGL.GL import *
+from editor.render.puregl import resources
+import numpy as np
+import functools
+import glm
+from editor.render import puregl
+from .paint import create_paint_program
+
+
+@functools.lru_cache(maxsize=16)
+def create_buffer(capacity):
+    """vao with a streamed vbo for up to capacity points, reused every frame"""
+    vbo = resources.buffers(1)
+    glBindBuffer(GL_ARRAY_BUFFER, vbo)
+    glBufferData(GL_ARRAY_BUFFER, capacity*3*4, None, GL_STREAM_DRAW)
+
+    vao = resources.vertex_arrays(1)
+    glBindVertexArray(vao)
+    glVertexAttribPointer(0, 3, GL_FLOAT, False, 0, None)
+    glEnableVertexAttribArray(0)
+    glBindVertexArray(0)
+    glBindBuffer(GL_ARRAY_BUFFER, 0)
+    return vao, vbo
+
+
+def graph(values, rect, max_value=None, capacity=None, markers=(), color=glm.vec3(0,1,0)):
+    """
+    Line graph of values inside the viewport rect
+    markers: values to draw horizontal lines at
+    """
+    values = np.asarray(values, dtype=np.float32)
+    capacity = max(capacity or len(values), len(values), 2)
+    max_value = max_value or float(values.max(initial=1.0))
+
+    vao, vbo = create_buffer(capacity)
+    prog = create_paint_program()
+
+    def upload(positions):
+        glBindBuffer(GL_ARRAY_BUFFER, vbo)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, positions.nbytes, positions)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    glViewport(*rect)
+    glDisable(GL_DEPTH_TEST)
+    with puregl.program.use(prog):
+        puregl.program.set_uniform(prog, "projection", np.eye(4))
+        puregl.program.set_uniform(prog, "view", np.eye(4))
+        puregl.program.set_uniform(prog, "model", np.eye(4))
+        glBindVertexArray(vao)
+
+        # markers
+        puregl.program.set_uniform(prog, "color", glm.vec3(0.5))
+        for marker in markers:
+            y = min(marker/max_value, 1.0)*2-1
+            upload(np.array([(-1, y, 0), (1, y, 0)], dtype=np.float32))
+            glDrawArrays(GL_LINES, 0, 2)
+
+        # values, newest on the right
+        if len(values):
+            positions = np.zeros((len(values), 3), dtype=np.float32)
+            positions[:, 0] = np.linspace(-1, 1, capacity, dtype=np.float32)[capacity-len(values):]
+            positions[:, 1] = np.minimum(values/max_value, 1.0)*2-1
+            upload(positions)
+            puregl.program.set_uniform(prog, "color", color)
+            glDrawArrays(GL_LINE_STRIP, 0, len(values))
+
+        glBindVertexArray(0)
@@ -1,4 +1,5 @@
 from OpenGL.GL import *
+from editor.render.puregl import resources
 import numpy as np
 from editor.render.puregl import program
 from editor.render import glsl
@@ -23,12 +24,12 @@ def grid(projection, view):
 
     # create buffers
     logging.debug("create grid buffers")
-    vbo = glGenBuffers(1)
+    vbo = resources.buffers(1)
     glBindBuffer(GL_ARRAY_BUFFER, vbo)
     glBufferData(GL_ARRAY_BUFFER, positions.nbytes, positions, GL_STATIC_DRAW)
     glBindBuffer(GL_ARRAY_BUFFER, vbo)
 
-    vao = glGenVertexArrays(1)
+    vao = resources.vertex_arrays(1)
 
     # create program
     logging.debug("create grid program")
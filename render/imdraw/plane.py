@@ -1,4 +1,5 @@
 from OpenGL.GL import *
+from editor.render.puregl import resources
 import numpy as np
 from .helpers import buffer_offset
 
@@ -12,9 +13,9 @@ def create_buffer(program):
     positions, uvs, normals, indices = geo.plane()
     logging.debug("create plane buffer")
     # setup VAO
-    vao = glGenVertexArrays(1)
+    vao = resources.vertex_arrays(1)
 
-    pos_vbo, uv_vbo, normal_vbo = glGenBuffers(3)  # FIXME: use single vbo for positions and vertices
+    pos_vbo, uv_vbo, normal_vbo = resources.buffers(3)  # FIXME: use single vbo for positions and vertices
     glBindVertexArray(vao)
 
     position_location = glGetAttribLocation(program, 'position')
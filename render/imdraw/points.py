@@ -1,4 +1,5 @@
 from OpenGL.GL import *
+from editor.render.puregl import resources
 import ctypes
 import logging
 
@@ -12,14 +13,14 @@ def points(prog, positions):
     # create vertex buffers
     logging.debug("create points buffers")
     if has_position:
-        pos_vbo = glGenBuffers(1)
+        pos_vbo = resources.buffers(1)
         glBindBuffer(GL_ARRAY_BUFFER, pos_vbo)
         glBufferData(GL_ARRAY_BUFFER, positions.nbytes, positions, GL_STATIC_DRAW)
     else:
         pos_vbo=None
 
     # create vao
-    vao = glGenVertexArrays(1)
+    vao = resources.vertex_arrays(1)
 
     # attach buffers to vao
     glBindVertexArray(vao)
@@ -36,6 +37,6 @@ def points(prog, positions):
     glBindVertexArray(0)
 
     # cleanup
-    glDeleteVertexArrays(1, vao)
+    resources.delete('vertex_array', vao)
     if pos_vbo:
-        glDeleteBuffers(1, pos_vbo)
+        resources.delete('buffer', pos_vbo)
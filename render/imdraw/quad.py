@@ -1,4 +1,5 @@
 from OpenGL.GL import *
+from editor.render.puregl import resources
 import numpy as np
 from .helpers import buffer_offset
 
@@ -34,9 +35,9 @@ def create_buffer(program):
     positions, uvs = quad_geo()
 
     # setup VAO
-    vao = glGenVertexArrays(1)
+    vao = resources.vertex_arrays(1)
 
-    pos_vbo, uv_vbo = glGenBuffers(2)  # FIXME: use single vbo for positions and vertices
+    pos_vbo, uv_vbo = resources.buffers(2)  # FIXME: use single vbo for positions and vertices
     glBindVertexArray(vao)
 
     position_location = glGetAttribLocation(program, 'position')
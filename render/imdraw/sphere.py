@@ -1,4 +1,6 @@
 from OpenGL.GL import *
+from editor.render.puregl import resources
+from editor.render.puregl import indices as puregl_indices
 import numpy as np
 from .helpers import buffer_offset
 import math
@@ -15,9 +17,9 @@ def create_buffer(program):
     logging.debug("create sphere buffer")
 
     # create VAO
-    vao = glGenVertexArrays(1)
+    vao = resources.vertex_arrays(1)
     
-    pos_vbo, uv_vbo, normal_vbo = glGenBuffers(3)  # FIXME: use single vbo for positions and vertices
+    pos_vbo, uv_vbo, normal_vbo = resources.buffers(3)  # FIXME: use single vbo for positions and vertices
     glBindVertexArray(vao)
     glBindBuffer(GL_ARRAY_BUFFER, pos_vbo)
     glBufferData(GL_ARRAY_BUFFER, positions.nbytes, positions, GL_STATIC_DRAW)
@@ -44,20 +46,21 @@ def create_buffer(program):
     glBindVertexArray(0)
 
     # create EBO
-    ebo = glGenBuffers(1)
+    indices = puregl_indices.compact(indices, len(positions))
+    ebo = resources.buffers(1)
     glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
     glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
     glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
 
-    return vao, ebo, indices.size
+    return vao, ebo, indices.size, puregl_indices.gltype(indices)
 
 
 def sphere(program):
-    vao, ebo, count = create_buffer(program)
+    vao, ebo, count, index_type = create_buffer(program)
 
     # draw sphere
     glBindVertexArray(vao)
     glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
-    glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, None)
+    glDrawElements(GL_TRIANGLES, count, index_type, None)
     glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
     glBindVertexArray(0)
@@ -1,4 +1,6 @@
 from OpenGL.GL import *
+from editor.render.puregl import resources
+from editor.render.puregl import indices as puregl_indices
 import logging
 import glm
 import numpy as np
@@ -101,7 +103,7 @@ def torusknot_geo(radius, tube, tubularSegments, radialSegments, p, q):
     positions = np.array([(p.x, p.y, p.z) for p in vertices]).astype(np.float32)
     normals = np.array([(p.x, p.y, p.z) for p in normals]).astype(np.float32)
     uvs = np.array(uvs).astype(np.float32).reshape(-1, 2)
-    indices = np.array(indices).astype(np.uint).reshape(-1, 3)
+    indices = np.array(indices).astype(np.uint32).reshape(-1, 3)
 
     return positions, normals, uvs, indices
 
@@ -115,9 +117,9 @@ def create_buffer(locations):
     count = indices.size
 
     # setup VAO
-    vao = glGenVertexArrays(1)
+    vao = resources.vertex_arrays(1)
     
-    pos_vbo, uv_vbo, normal_vbo = glGenBuffers(3) # FIXME: use single vbo for positions and vertices
+    pos_vbo, uv_vbo, normal_vbo = resources.buffers(3) # FIXME: use single vbo for positions and vertices
     glBindVertexArray(vao)
     glBindBuffer(GL_ARRAY_BUFFER, pos_vbo)
     glBufferData(GL_ARRAY_BUFFER, positions.nbytes, positions, GL_STATIC_DRAW)
@@ -147,21 +149,22 @@ def create_buffer(locations):
     glBindVertexArray(0)
 
     # create ebo
-    ebo = glGenBuffers(1)
+    indices = puregl_indices.compact(indices, len(positions))
+    ebo = resources.buffers(1)
     glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
     glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
     glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
 
-    return vao, ebo, count
+    return vao, ebo, count, puregl_indices.gltype(indices)
 
 
 def torusknot(prog):
     locations = tuple(glGetAttribLocation(prog, name) for name in ("position", 'uv', 'normal'))
-    vao, ebo, count = create_buffer(locations)
+    vao, ebo, count, index_type = create_buffer(locations)
 
     # draw
     glBindVertexArray(vao)
     glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
-    glDrawElements(GL_TRIANGLES, count, GL_UNSIGNED_INT, None)
+    glDrawElements(GL_TRIANGLES, count, index_type, None)
     glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
     glBindVertexArray(0)
@@ -1,4 +1,6 @@
 from OpenGL.GL import *
+from editor.render.puregl import resources
+from editor.render.puregl import indices as puregl_indices
 import ctypes
 
 
@@ -14,34 +16,35 @@ def triangles(prog, positions, indices, normals=None, uvs=None):
 
     # create vertex buffers
     if has_position:
-        pos_vbo = glGenBuffers(1)
+        pos_vbo = resources.buffers(1)
         glBindBuffer(GL_ARRAY_BUFFER, pos_vbo)
         glBufferData(GL_ARRAY_BUFFER, positions.nbytes, positions, GL_STATIC_DRAW)
     else:
         pos_vbo=None
 
     if has_normal:
-        norm_vbo = glGenBuffers(1)
+        norm_vbo = resources.buffers(1)
         glBindBuffer(GL_ARRAY_BUFFER, norm_vbo)
         glBufferData(GL_ARRAY_BUFFER, normals.nbytes, normals, GL_STATIC_DRAW)
     else:
         norm_vbo=None
 
     if has_uv:
-        uv_vbo = glGenBuffers(1)
+        uv_vbo = resources.buffers(1)
         glBindBuffer(GL_ARRAY_BUFFER, uv_vbo)
         glBufferData(GL_ARRAY_BUFFER, uvs.nbytes, uvs, GL_STATIC_DRAW)
     else:
         uv_vbo = None
 
     # create element buffer
-    ebo = glGenBuffers(1)
+    indices = puregl_indices.compact(indices)
+    ebo = resources.buffers(1)
     glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
     glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
     glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
 
     # create vao
-    vao = glGenVertexArrays(1)
+    vao = resources.vertex_arrays(1)
 
     # attach buffers to vao
     glBindVertexArray(vao)
@@ -64,16 +67,16 @@ def triangles(prog, positions, indices, normals=None, uvs=None):
     # draw
     glBindVertexArray(vao)
     glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
-    glDrawElements(GL_TRIANGLES, indices.size, GL_UNSIGNED_INT, None)
+    glDrawElements(GL_TRIANGLES, indices.size, puregl_indices.gltype(indices), None)
     glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
     glBindVertexArray(0)
 
     # cleanup
-    glDeleteVertexArrays(1, vao)
-    glDeleteBuffers(1, ebo)
+    resources.delete('vertex_array', vao)
+    resources.delete('buffer', ebo)
     if pos_vbo:
-        glDeleteBuffers(1, pos_vbo)
+        resources.delete('buffer', pos_vbo)
     if norm_vbo:
-        glDeleteBuffers(1, norm_vbo)
+        resources.delete('buffer', norm_vbo)
     if uv_vbo:
-        glDeleteBuffers(1, uv_vbo)
+        resources.delete('buffer', uv_vbo)
@@ -1,4 +1,9 @@
+from . import resources
+from . import indices
+from . import ubo
 from . import program
 from . import fbo
 from . import texture
 from . import transform
+from . import debug
+from . import warmup
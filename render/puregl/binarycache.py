@@ -0,0 +1,102 @@
+"""Linked program binaries persisted between launches
+
+binaries are stored in the editor disk cache, keyed by the shader sources and
+the GL vendor, renderer and version strings. a binary the driver rejects, eg.
+after a driver update with the same version string, is dropped and the program
+is compiled again. hit rates are listed in editor.utils.cacheStats().
+"""
+from OpenGL.GL import *
+from OpenGL.error import GLError
+from editor import utils, diskcache
+from . import resources
+import numpy as np
+import threading
+import logging
+
+enabled = True
+
+
+class ProgramBinaryCache:
+	def __init__(self, name="puregl.program.binary"):
+		self.name = name
+		self.disk = None # the editor disk cache, on first use
+		self._context = dict() # thread -> gl vendor, renderer and version, None when unsupported
+		self.hits = 0
+		self.misses = 0
+		self.rejected = 0
+		self.stores = 0
+		utils.caches[name] = self
+
+	def supported(self):
+		"""vendor, renderer and version of the current context, None without binary formats"""
+		thread = threading.get_ident()
+		if thread not in self._context:
+			if glGetIntegerv(GL_NUM_PROGRAM_BINARY_FORMATS) > 0:
+				self._context[thread] = tuple(glGetString(name).decode('utf-8') for name in (GL_VENDOR, GL_RENDERER, GL_VERSION))
+			else:
+				self._context[thread] = None
+		return self._context[thread]
+
+	def key(self, sources):
+		context = self.supported()
+		if not enabled or context is None:
+			return None
+		if self.disk is None:
+			self.disk = diskcache.default()
+		return self.disk.key(self.name, context, sources)
+
+	def load(self, sources):
+		"""a linked program from its binary, or None"""
+		key = self.key(sources)
+		if key is None:
+			return None
+		entry = self.disk.get(key)
+		if entry is None:
+			self.misses+=1
+			return None
+		binary_format, binary = entry
+		binary = np.frombuffer(binary, dtype=np.uint8)
+		program = resources.program()
+		try:
+			glProgramBinary(program, binary_format, binary, binary.size)
+			linked = glGetProgramiv(program, GL_LINK_STATUS)
+		except GLError:
+			linked = False
+		if not linked:
+			logging.info("program binary rejected by the driver, compiling")
+			resources.delete('program', program)
+			self.rejected+=1
+			return None
+		self.hits+=1
+		return program
+
+	def store(self, program, sources):
+		key = self.key(sources)
+		if key is None:
+			return
+		size = int(glGetProgramiv(program, GL_PROGRAM_BINARY_LENGTH))
+		if not size:
+			return
+		length = np.zeros(1, dtype=np.int32)
+		binary_format = np.zeros(1, dtype=np.uint32)
+		binary = np.zeros(size, dtype=np.uint8)
+		glGetProgramBinary(program, size, length, binary_format, binary)
+		self.disk.put(key, (int(binary_format[0]), binary[:length[0]].tobytes()))
+		self.stores+=1
+
+	def clear(self):
+		"""forget the probed contexts, entries stay on disk until collected"""
+		self._context.clear()
+
+	def stats(self)->dict:
+		lookups = self.hits+self.misses+self.rejected
+		return {
+			'hits': self.hits,
+			'misses': self.misses,
+			'rejected': self.rejected,
+			'stores': self.stores,
+			'hitRate': self.hits/lookups if lookups else 0.0
+		}
+
+
+cache = ProgramBinaryCache()
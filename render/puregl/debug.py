@@ -0,0 +1,165 @@
+"""GL call counting debug layer
+
+	from editor.render.puregl import debug
+	debug.install() # after the modules to inspect are imported
+	...
+	debug.begin_frame()
+	draw()
+	debug.end_frame()
+	print(debug.report())
+
+wraps the OpenGL.GL functions star-imported into the editor.render.puregl,
+imdraw and graphics modules. per frame it counts calls by function, state changes
+that dont change the state, and objects created after the warmup frames
+(eg. buffers generated every frame) with the location of the caller.
+the state shadow only sees wrapped calls, it is reset every frame.
+"""
+from OpenGL import GL
+from collections import Counter, deque
+import functools
+import logging
+import sys
+import os
+
+MODULES = ("editor.render.puregl", "editor.render.imdraw", "editor.render.graphics")
+
+# object creation in these frames is setup, not a leak
+WARMUP_FRAMES = 2
+
+CREATE_FUNCTIONS = {
+	'glGenBuffers', 'glGenTextures', 'glGenVertexArrays', 'glGenFramebuffers',
+	'glGenRenderbuffers', 'glGenQueries', 'glCreateProgram', 'glCreateShader'
+}
+
+installed = False
+dump = False
+_originals = dict() # (module, name) -> original function
+_wrappers = dict()  # name -> counting wrapper
+
+
+class Frame:
+	def __init__(self, index):
+		self.index = index
+		self.calls = Counter()
+		self.redundant = Counter()
+		self.creations = Counter() # (function, caller) -> count
+		self.state = dict()
+		self.texture_unit = GL.GL_TEXTURE0
+
+	def _set(self, key, value):
+		"""update the shadow state, return True when the call changed nothing"""
+		if self.state.get(key, object()) == value:
+			return True
+		self.state[key] = value
+		return False
+
+	def track(self, name, args):
+		"""shadow the bindings and capabilities set by the call"""
+		if name == 'glEnable' or name == 'glDisable':
+			return self._set(('cap', int(args[0])), name == 'glEnable')
+		if name == 'glActiveTexture':
+			self.texture_unit = int(args[0])
+			return self._set(('active_texture',), self.texture_unit)
+		if name == 'glBindTexture':
+			return self._set(('texture', self.texture_unit, int(args[0])), int(args[1]))
+		if name in ('glBindBuffer', 'glBindFramebuffer', 'glBindRenderbuffer'):
+			return self._set((name, int(args[0])), int(args[1]))
+		if name in ('glUseProgram', 'glBindVertexArray'):
+			return self._set((name,), int(args[0]))
+		if name == 'glViewport':
+			return self._set((name,), tuple(int(v) for v in args))
+		if name in ('glGetAttribLocation', 'glGetUniformLocation'):
+			# a query cached per program, asked again every frame
+			return self._set((name, int(args[0]), args[1]), True)
+		return False
+
+
+_frame = None
+_count = 0
+frames = deque(maxlen=120)
+
+
+_PUREGL = os.path.dirname(os.path.abspath(__file__))+os.sep
+def _caller():
+	"""the first call site outside puregl, which only forwards to GL, eg. resources.create"""
+	frame = sys._getframe(2)
+	while frame.f_back is not None and os.path.abspath(frame.f_code.co_filename).startswith(_PUREGL):
+		frame = frame.f_back
+	return "{}:{}".format(frame.f_code.co_filename, frame.f_lineno)
+
+
+def _wrap(name, fn):
+	@functools.wraps(fn)
+	def wrapper(*args, **kwargs):
+		if _frame is not None:
+			_frame.calls[name]+=1
+			try:
+				if _frame.track(name, args):
+					_frame.redundant[name]+=1
+			except (TypeError, ValueError, IndexError):
+				pass
+			if name in CREATE_FUNCTIONS and _frame.index >= WARMUP_FRAMES:
+				_frame.creations[(name, _caller())]+=1
+		return fn(*args, **kwargs)
+	wrapper.__wrapped_gl__ = fn
+	return wrapper
+
+
+def install(modules=MODULES):
+	"""wrap the GL functions in every loaded module under the given packages"""
+	global installed
+	for modulename, module in list(sys.modules.items()):
+		if module is None or not modulename.startswith(modules):
+			continue
+		for name, value in list(vars(module).items()):
+			if not name.startswith('gl') or getattr(GL, name, None) is not value:
+				continue
+			if name not in _wrappers:
+				_wrappers[name] = _wrap(name, value)
+			_originals[(modulename, name)] = value
+			setattr(module, name, _wrappers[name])
+	installed = True
+
+
+def uninstall():
+	global installed, _frame
+	for (modulename, name), fn in _originals.items():
+		module = sys.modules.get(modulename)
+		if module is not None:
+			setattr(module, name, fn)
+	_originals.clear()
+	_frame = None
+	installed = False
+
+
+def begin_frame():
+	global _frame
+	if installed:
+		_frame = Frame(_count)
+
+
+def end_frame():
+	global _frame, _count
+	if _frame is None:
+		return
+	frames.append(_frame)
+	_frame = None
+	_count+=1
+	if dump:
+		logging.info(report())
+
+
+def report(frame=None)->str:
+	"""calls, redundant calls and leaked objects of the last frame"""
+	frame = frame or (frames[-1] if frames else None)
+	if frame is None:
+		return "no frame recorded"
+	lines = ["frame {}: {} gl calls".format(frame.index, sum(frame.calls.values()))]
+	lines.append("{:<32} {:>8} {:>10}".format("function", "calls", "redundant"))
+	for name, count in frame.calls.most_common():
+		lines.append("{:<32} {:>8} {:>10}".format(name, count, frame.redundant.get(name, 0)))
+	if frame.creations:
+		lines.append("objects created in the frame loop:")
+		for (name, caller), count in frame.creations.most_common():
+			lines.append("  {} x{} at {}".format(name, count, caller))
+	return "\n".join(lines)
@@ -0,0 +1,28 @@
+from OpenGL.GL import *
+import numpy as np
+
+# index dtype -> GL type for glDrawElements
+GL_TYPES = {
+	np.dtype(np.uint16): GL_UNSIGNED_SHORT,
+	np.dtype(np.uint32): GL_UNSIGNED_INT
+}
+
+# largest vertex count addressed with 16 bit indices, 0xFFFF is left for primitive restart
+MAX_UINT16_VERTICES = 0xFFFF
+
+
+def compact(indices, vertex_count=None):
+	"""
+	indices as uint16 when every vertex fits, uint32 otherwise.
+	vertex_count defaults to the largest index+1, converts only when the dtype differs
+	"""
+	indices = np.asarray(indices)
+	if vertex_count is None:
+		vertex_count = int(indices.max())+1 if indices.size else 0
+	dtype = np.uint16 if vertex_count <= MAX_UINT16_VERTICES else np.uint32
+	return np.ascontiguousarray(indices, dtype=dtype)
+
+
+def gltype(indices):
+	"""GL type of the compacted index array"""
+	return GL_TYPES[np.dtype(indices.dtype)]
@@ -1,52 +1,236 @@
 from OpenGL.GL import *
+from . import resources
+from . import ubo
+from . import binarycache
 from contextlib import contextmanager
 from editor.utils import memoize
+import numpy as np
 
 import logging
-import functools
 
+# GL_KHR_parallel_shader_compile, same value for the ARB extension
+GL_COMPLETION_STATUS_KHR = 0x91B1
 
-@functools.lru_cache(maxsize=None)
+
+# (vs, fs, gs) -> (program, shaders) started by prefetch, finished by create
+_started = dict()
+
+
+@memoize(name="puregl.program.create")
 def create(vs, fs, gs=None):
 	logging.debug('create program')
-	# create vertex shader
-	vertex_shader = glCreateShader(GL_VERTEX_SHADER)
-	glShaderSource(vertex_shader, vs)
-	glCompileShader(vertex_shader)
-	if glGetShaderiv(vertex_shader, GL_INFO_LOG_LENGTH): # compilation error check
-		raise Exception(glGetShaderInfoLog(vertex_shader))
-
-	# create fragment shader
-	fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)
-	glShaderSource(fragment_shader, fs)
-	glCompileShader(fragment_shader)
-	if glGetShaderiv(fragment_shader, GL_INFO_LOG_LENGTH): # compilation error check
-		raise Exception(glGetShaderInfoLog(fragment_shader))
-
-	# create geometry shader
-	if gs:
-		geometry_shader = glCreateShader(GL_GEOMETRY_SHADER)
-		glShaderSource(geometry_shader, gs)
-		glCompileShader(geometry_shader)
-		if glGetShaderiv(geometry_shader, GL_INFO_LOG_LENGTH):
-			raise Exception(glGetShaderInfoLog(geometry_shader))
+	sources = (vs, fs, gs)
+	started = _started.pop(sources, None)
+	if started is not None:
+		program, shaders = started
+		finish(program, shaders)
+	else:
+		program, shaders = binarycache.cache.load(sources), []
+		if program is None:
+			program, shaders = start(vs, fs, gs)
+			finish(program, shaders)
+	if shaders:
+		# built from source
+		binarycache.cache.store(program, sources)
+	return Program(program)
+
+
+def prefetch(vs, fs, gs=None):
+	"""start building the program without waiting for the driver, create() picks it up"""
+	sources = (vs, fs, gs)
+	if sources in _started or create.contains(*(sources if gs else sources[:2])):
+		return
+	program = binarycache.cache.load(sources)
+	if program is not None:
+		_started[sources] = program, []
+	else:
+		_started[sources] = start(vs, fs, gs)
+
+
+def is_ready(vs, fs, gs=None):
+	"""False while a prefetched program is still compiling in the background,
+	needs GL_KHR_parallel_shader_compile or GL_ARB_parallel_shader_compile"""
+	started = _started.get((vs, fs, gs))
+	if started is None or not started[1]:
+		return True
+	return bool(glGetProgramiv(started[0], GL_COMPLETION_STATUS_KHR))
+
+
+def start(vs, fs, gs=None):
+	"""compile and link without reading the status, returns (program, shaders)"""
+	shaders = []
+	for shader_type, source in ((GL_VERTEX_SHADER, vs), (GL_FRAGMENT_SHADER, fs), (GL_GEOMETRY_SHADER, gs)):
+		if not source:
+			continue
+		shader = glCreateShader(shader_type)
+		glShaderSource(shader, source)
+		glCompileShader(shader)
+		shaders.append(shader)
 
 	# link shaders
-	program = glCreateProgram()
-	glAttachShader(program, vertex_shader)
-	glAttachShader(program, fragment_shader)
-	if gs:
-		glAttachShader(program, geometry_shader)
+	program = resources.program()
+	if binarycache.enabled:
+		glProgramParameteri(program, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE)
+	for shader in shaders:
+		glAttachShader(program, shader)
 	glLinkProgram(program)
-	if glGetProgramiv(program, GL_INFO_LOG_LENGTH): # link error check
-		raise Exception(glGetProgramInfoLog(program))
+	return program, shaders
+
 
+def finish(program, shaders):
+	"""wait for the build, raise on compile and link errors"""
+	try:
+		for shader in shaders:
+			if glGetShaderiv(shader, GL_INFO_LOG_LENGTH): # compilation error check
+				raise Exception(glGetShaderInfoLog(shader))
+		if glGetProgramiv(program, GL_INFO_LOG_LENGTH): # link error check
+			raise Exception(glGetProgramInfoLog(program))
+	finally:
+		# flagged, deleted with the program
+		for shader in shaders:
+			glDeleteShader(shader)
 	return program
 
 
+def build(vs, fs, gs=None):
+	"""compile and link the shaders, returns the GL program name"""
+	return finish(*start(vs, fs, gs))
+
+
+# GL functions are looked up by name on every call, like in the scalar setters,
+# so wrappers installed later, eg. by puregl.debug, see the uploads
+def _vector(function, dtype):
+	def setter(location, count, value):
+		globals()[function](location, count, np.asarray(value, dtype=dtype))
+	return setter
+
+
+def _matrix(function):
+	def setter(location, count, value):
+		globals()[function](location, count, False, np.asarray(value, dtype=np.float32))
+	return setter
+
+
+# ints, bools and samplers
+SET_INT = (lambda location, count, value: glUniform1i(location, value), int)
+
+SAMPLERS = (
+	GL_SAMPLER_1D, GL_SAMPLER_2D, GL_SAMPLER_3D, GL_SAMPLER_CUBE,
+	GL_SAMPLER_1D_SHADOW, GL_SAMPLER_2D_SHADOW, GL_SAMPLER_CUBE_SHADOW,
+	GL_SAMPLER_1D_ARRAY, GL_SAMPLER_2D_ARRAY, GL_SAMPLER_1D_ARRAY_SHADOW, GL_SAMPLER_2D_ARRAY_SHADOW,
+	GL_SAMPLER_2D_MULTISAMPLE, GL_SAMPLER_2D_MULTISAMPLE_ARRAY, GL_SAMPLER_2D_RECT, GL_SAMPLER_2D_RECT_SHADOW, GL_SAMPLER_BUFFER,
+	GL_INT_SAMPLER_1D, GL_INT_SAMPLER_2D, GL_INT_SAMPLER_3D, GL_INT_SAMPLER_CUBE,
+	GL_INT_SAMPLER_1D_ARRAY, GL_INT_SAMPLER_2D_ARRAY, GL_INT_SAMPLER_2D_MULTISAMPLE,
+	GL_INT_SAMPLER_2D_MULTISAMPLE_ARRAY, GL_INT_SAMPLER_2D_RECT, GL_INT_SAMPLER_BUFFER,
+	GL_UNSIGNED_INT_SAMPLER_1D, GL_UNSIGNED_INT_SAMPLER_2D, GL_UNSIGNED_INT_SAMPLER_3D, GL_UNSIGNED_INT_SAMPLER_CUBE,
+	GL_UNSIGNED_INT_SAMPLER_1D_ARRAY, GL_UNSIGNED_INT_SAMPLER_2D_ARRAY, GL_UNSIGNED_INT_SAMPLER_2D_MULTISAMPLE,
+	GL_UNSIGNED_INT_SAMPLER_2D_MULTISAMPLE_ARRAY, GL_UNSIGNED_INT_SAMPLER_2D_RECT, GL_UNSIGNED_INT_SAMPLER_BUFFER
+)
+
+# GL type -> (setter, dtype of the value)
+SETTERS = {
+	GL_FLOAT: (lambda location, count, value: glUniform1f(location, value), float),
+	GL_FLOAT_VEC2: (_vector('glUniform2fv', np.float32), np.float32),
+	GL_FLOAT_VEC3: (_vector('glUniform3fv', np.float32), np.float32),
+	GL_FLOAT_VEC4: (_vector('glUniform4fv', np.float32), np.float32),
+	GL_INT: SET_INT,
+	GL_INT_VEC2: (_vector('glUniform2iv', np.int32), np.int32),
+	GL_INT_VEC3: (_vector('glUniform3iv', np.int32), np.int32),
+	GL_INT_VEC4: (_vector('glUniform4iv', np.int32), np.int32),
+	GL_UNSIGNED_INT: (lambda location, count, value: glUniform1ui(location, value), int),
+	GL_UNSIGNED_INT_VEC2: (_vector('glUniform2uiv', np.uint32), np.uint32),
+	GL_UNSIGNED_INT_VEC3: (_vector('glUniform3uiv', np.uint32), np.uint32),
+	GL_UNSIGNED_INT_VEC4: (_vector('glUniform4uiv', np.uint32), np.uint32),
+	GL_BOOL: SET_INT,
+	GL_BOOL_VEC2: (_vector('glUniform2iv', np.int32), np.int32),
+	GL_BOOL_VEC3: (_vector('glUniform3iv', np.int32), np.int32),
+	GL_BOOL_VEC4: (_vector('glUniform4iv', np.int32), np.int32),
+	GL_FLOAT_MAT2: (_matrix('glUniformMatrix2fv'), np.float32),
+	GL_FLOAT_MAT3: (_matrix('glUniformMatrix3fv'), np.float32),
+	GL_FLOAT_MAT4: (_matrix('glUniformMatrix4fv'), np.float32),
+	GL_FLOAT_MAT2x3: (_matrix('glUniformMatrix2x3fv'), np.float32),
+	GL_FLOAT_MAT2x4: (_matrix('glUniformMatrix2x4fv'), np.float32),
+	GL_FLOAT_MAT3x2: (_matrix('glUniformMatrix3x2fv'), np.float32),
+	GL_FLOAT_MAT3x4: (_matrix('glUniformMatrix3x4fv'), np.float32),
+	GL_FLOAT_MAT4x2: (_matrix('glUniformMatrix4x2fv'), np.float32),
+	GL_FLOAT_MAT4x3: (_matrix('glUniformMatrix4x3fv'), np.float32)
+}
+SETTERS.update({sampler: SET_INT for sampler in SAMPLERS})
+
+
+class Program(int):
+	"""
+	GL program name with the active uniforms and attributes introspected once after linking
+
+	set_uniform looks up the cached location and the setter for the uniform type,
+	and skips the upload when the value equals the last one uploaded.
+	uniforms set with glUniform* directly bypass the cache.
+	"""
+	def __init__(self, name):
+		self.uniforms = dict() # name -> (location, count, setter, dtype)
+		self._values = dict()  # location -> last value uploaded
+		for i in range(glGetProgramiv(self, GL_ACTIVE_UNIFORMS)):
+			uniform, count, gltype = glGetActiveUniform(self, i)
+			uniform = uniform.decode('utf-8') if isinstance(uniform, bytes) else uniform
+			location = glGetUniformLocation(self, uniform)
+			if location < 0: # in a uniform block
+				continue
+			if int(gltype) not in SETTERS:
+				# eg. double precision types, uploading them with glUniform1i would be wrong
+				logging.error("uniform {} has unsupported type {:#x}, it cant be set".format(uniform, int(gltype)))
+				continue
+			setter, dtype = SETTERS[int(gltype)]
+			base = uniform[:-3] if uniform.endswith("[0]") else uniform
+			if count>1: # elements of arrays are addressed by name too
+				for j in range(int(count)):
+					self.uniforms["{}[{}]".format(base, j)] = (location+j, 1, setter, dtype)
+				if int(gltype) == GL_UNSIGNED_INT:
+					setter, dtype = _vector('glUniform1uiv', np.uint32), np.uint32
+				elif dtype is int:
+					setter, dtype = _vector('glUniform1iv', np.int32), np.int32
+				elif dtype is float:
+					setter, dtype = _vector('glUniform1fv', np.float32), np.float32
+			self.uniforms[base] = (location, int(count), setter, dtype)
+		self.attributes = dict() # name -> location of the active vertex attributes
+		for i in range(glGetProgramiv(self, GL_ACTIVE_ATTRIBUTES)):
+			attribute, size, gltype = glGetActiveAttrib(self, i)
+			attribute = attribute.decode('utf-8') if isinstance(attribute, bytes) else attribute
+			self.attributes[attribute] = glGetAttribLocation(self, attribute)
+		self.uploads = 0
+		self.skipped = 0
+		ubo.bind_blocks(self)
+
+	def location(self, name):
+		uniform = self.uniforms.get(name)
+		return uniform[0] if uniform else -1
+
+	def attribute_location(self, name):
+		return self.attributes.get(name, -1)
+
+	def set_uniform(self, name, value):
+		"""upload when changed, the program must be in use"""
+		uniform = self.uniforms.get(name)
+		if uniform is None:
+			return # not active, optimized away by the compiler
+		location, count, setter, dtype = uniform
+		if dtype is int or dtype is float:
+			key = dtype(value)
+		else:
+			key = np.asarray(value, dtype=dtype).tobytes()
+		if self._values.get(location) == key:
+			self.skipped+=1
+			return
+		self._values[location] = key
+		self.uploads+=1
+		setter(location, count, value)
+
+
 def set_uniform(program, name, value):
+	if isinstance(program, Program):
+		program.set_uniform(name, value)
+		return
+
 	import glm
-	import numpy as np
 	location = glGetUniformLocation(program, name)
 
 	# if location<0:
@@ -0,0 +1,261 @@
+"""GPU resource registry
+
+	from editor.render.puregl import resources
+	with resources.owner("GeometryPass"):
+		tex = resources.textures(1)  # instead of glGenTextures(1)
+	...
+	print(resources.report())        # estimated bytes by owner and kind
+	resources.delete('texture', tex)
+
+every buffer, texture, renderbuffer, framebuffer, vertex array and program is
+created through here and remembered with its owner and the thread it was created
+on. delete() on another thread, or release() from a __del__, queues the name
+until collect() runs on the owning thread. sizes are estimated on demand from
+the internal format and dimensions queried from GL. resources still alive at
+exit are logged as leaks.
+"""
+from OpenGL.GL import *
+from OpenGL.error import GLError
+from contextlib import contextmanager
+from collections import defaultdict
+import numpy as np
+import threading
+import logging
+import atexit
+
+# bytes per texel of sized internal formats, unsized formats as their usual size
+FORMAT_BYTES = {
+	GL_R8: 1, GL_RED: 1, GL_R16F: 2, GL_R32F: 4,
+	GL_RG8: 2, GL_RG: 2, GL_RG16F: 4, GL_RG32F: 8,
+	GL_RGB8: 3, GL_RGB: 3, GL_RGB16F: 6, GL_RGB32F: 12,
+	GL_RGBA8: 4, GL_RGBA: 4, GL_RGBA16F: 8, GL_RGBA32F: 16,
+	GL_SRGB8: 3, GL_SRGB8_ALPHA8: 4, GL_R11F_G11F_B10F: 4,
+	GL_DEPTH_COMPONENT: 4, GL_DEPTH_COMPONENT16: 2, GL_DEPTH_COMPONENT24: 4, GL_DEPTH_COMPONENT32F: 4,
+	GL_DEPTH24_STENCIL8: 4, GL_DEPTH32F_STENCIL8: 8
+}
+
+_gen = {
+	'buffer': (lambda n: glGenBuffers(n)),
+	'texture': (lambda n: glGenTextures(n)),
+	'vertex_array': (lambda n: glGenVertexArrays(n)),
+	'framebuffer': (lambda n: glGenFramebuffers(n)),
+	'renderbuffer': (lambda n: glGenRenderbuffers(n))
+}
+
+_delete = {
+	'buffer': (lambda names: glDeleteBuffers(len(names), names)),
+	'texture': (lambda names: glDeleteTextures(names)),
+	'vertex_array': (lambda names: glDeleteVertexArrays(len(names), names)),
+	'framebuffer': (lambda names: glDeleteFramebuffers(len(names), names)),
+	'renderbuffer': (lambda names: glDeleteRenderbuffers(len(names), names)),
+	'program': (lambda names: [glDeleteProgram(name) for name in names])
+}
+
+
+class Resource:
+	__slots__ = ('kind', 'name', 'owner', 'thread', 'nbytes')
+	def __init__(self, kind, name, owner, thread):
+		self.kind = kind
+		self.name = name
+		self.owner = owner
+		self.thread = thread
+		self.nbytes = 0
+
+
+_lock = threading.Lock()
+_local = threading.local()
+_resources = dict() # (kind, name) -> Resource
+_pending = defaultdict(list) # thread -> [(kind, name)] to delete there
+
+
+@contextmanager
+def owner(label):
+	"""resources created in the block belong to label, eg. a pass or an asset"""
+	if not isinstance(label, str):
+		label = type(label).__name__
+	stack = getattr(_local, 'owners', None)
+	if stack is None:
+		stack = _local.owners = []
+	stack.append(label)
+	try:
+		yield label
+	finally:
+		stack.pop()
+
+
+def current_owner():
+	stack = getattr(_local, 'owners', None)
+	return stack[-1] if stack else None
+
+
+def register(kind, names):
+	"""remember names created elsewhere, returns them unchanged"""
+	thread = threading.get_ident()
+	label = current_owner()
+	with _lock:
+		for name in np.atleast_1d(names):
+			_resources[(kind, int(name))] = Resource(kind, int(name), label, thread)
+	return names
+
+
+def create(kind, n=1):
+	"""glGen* of kind, the result has the same shape as the GL call"""
+	return register(kind, _gen[kind](n))
+
+
+def buffers(n=1):
+	return create('buffer', n)
+
+
+def textures(n=1):
+	return create('texture', n)
+
+
+def vertex_arrays(n=1):
+	return create('vertex_array', n)
+
+
+def framebuffers(n=1):
+	return create('framebuffer', n)
+
+
+def renderbuffers(n=1):
+	return create('renderbuffer', n)
+
+
+def program():
+	return register('program', glCreateProgram())
+
+
+def _delete_now(kind, names):
+	names = [name for name in names if name]
+	if names:
+		_delete[kind](np.array(names, dtype=np.uint32))
+
+
+def delete(kind, *names):
+	"""delete now when called on the owning thread, otherwise on its next collect()"""
+	thread = threading.get_ident()
+	now = []
+	with _lock:
+		for group in names:
+			for name in np.atleast_1d(group):
+				resource = _resources.pop((kind, int(name)), None)
+				if resource is None or resource.thread == thread:
+					now.append(int(name))
+				else:
+					_pending[resource.thread].append((kind, int(name)))
+	_delete_now(kind, now)
+
+
+def release(kind, *names):
+	"""safe from __del__ and other threads, deleted by the owning thread's collect()"""
+	with _lock:
+		for group in names:
+			for name in np.atleast_1d(group):
+				resource = _resources.pop((kind, int(name)), None)
+				if resource is not None:
+					_pending[resource.thread].append((kind, int(name)))
+
+
+def collect():
+	"""delete the names released for this thread, call once per frame"""
+	with _lock:
+		pending = _pending.pop(threading.get_ident(), [])
+	bykind = defaultdict(list)
+	for kind, name in pending:
+		bykind[kind].append(name)
+	for kind, names in bykind.items():
+		_delete_now(kind, names)
+
+
+def _texture_nbytes(name):
+	for target, faces in ((GL_TEXTURE_2D, (GL_TEXTURE_2D,)), (GL_TEXTURE_CUBE_MAP, [GL_TEXTURE_CUBE_MAP_POSITIVE_X+i for i in range(6)])):
+		previous = glGetIntegerv(GL_TEXTURE_BINDING_2D if target==GL_TEXTURE_2D else GL_TEXTURE_BINDING_CUBE_MAP)
+		try:
+			glBindTexture(target, name)
+		except GLError:
+			continue # created for another target
+		try:
+			nbytes = 0
+			for face in faces:
+				level = 0
+				while True:
+					width = glGetTexLevelParameteriv(face, level, GL_TEXTURE_WIDTH)
+					if not width:
+						break
+					height = glGetTexLevelParameteriv(face, level, GL_TEXTURE_HEIGHT)
+					internal_format = glGetTexLevelParameteriv(face, level, GL_TEXTURE_INTERNAL_FORMAT)
+					nbytes += int(width)*int(height)*FORMAT_BYTES.get(int(internal_format), 4)
+					level+=1
+			return nbytes
+		finally:
+			glBindTexture(target, previous)
+	return 0
+
+
+def _nbytes(resource):
+	if resource.kind == 'buffer':
+		previous = glGetIntegerv(GL_COPY_READ_BUFFER_BINDING)
+		glBindBuffer(GL_COPY_READ_BUFFER, resource.name)
+		nbytes = glGetBufferParameteriv(GL_COPY_READ_BUFFER, GL_BUFFER_SIZE)
+		glBindBuffer(GL_COPY_READ_BUFFER, previous)
+		return int(nbytes)
+	if resource.kind == 'renderbuffer':
+		previous = glGetIntegerv(GL_RENDERBUFFER_BINDING)
+		glBindRenderbuffer(GL_RENDERBUFFER, resource.name)
+		width = glGetRenderbufferParameteriv(GL_RENDERBUFFER, GL_RENDERBUFFER_WIDTH)
+		height = glGetRenderbufferParameteriv(GL_RENDERBUFFER, GL_RENDERBUFFER_HEIGHT)
+		internal_format = glGetRenderbufferParameteriv(GL_RENDERBUFFER, GL_RENDERBUFFER_INTERNAL_FORMAT)
+		samples = max(1, int(glGetRenderbufferParameteriv(GL_RENDERBUFFER, GL_RENDERBUFFER_SAMPLES)))
+		glBindRenderbuffer(GL_RENDERBUFFER, previous)
+		return int(width)*int(height)*samples*FORMAT_BYTES.get(int(internal_format), 4)
+	if resource.kind == 'texture':
+		return _texture_nbytes(resource.name)
+	return 0
+
+
+def measure():
+	"""estimate the size of the resources of this thread from GL, needs the context current"""
+	thread = threading.get_ident()
+	with _lock:
+		resources = [resource for resource in _resources.values() if resource.thread == thread]
+	for resource in resources:
+		try:
+			resource.nbytes = _nbytes(resource)
+		except GLError as err:
+			logging.debug("cant measure {} {}: {}".format(resource.kind, resource.name, err))
+
+
+def totals(measured=True)->dict:
+	"""owner -> kind -> (count, bytes)"""
+	if measured:
+		measure()
+	result = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+	with _lock:
+		for resource in _resources.values():
+			entry = result[resource.owner or "-"][resource.kind]
+			entry[0]+=1
+			entry[1]+=resource.nbytes
+	return {owner: {kind: tuple(entry) for kind, entry in kinds.items()} for owner, kinds in result.items()}
+
+
+def report(measured=True)->str:
+	lines = ["{:<32} {:<14} {:>6} {:>10}".format("owner", "kind", "count", "MiB")]
+	for label, kinds in sorted(totals(measured).items()):
+		for kind, (count, nbytes) in sorted(kinds.items()):
+			lines.append("{:<32} {:<14} {:>6} {:>10.2f}".format(label, kind, count, nbytes/1024**2))
+	return "\n".join(lines)
+
+
+def leaks()->list:
+	with _lock:
+		return list(_resources.values())
+
+
+@atexit.register
+def _report_leaks():
+	alive = leaks()
+	if alive:
+		# no GL calls here, the context is probably gone
+		logging.warning("{} GPU resources were never deleted:\n{}".format(len(alive), report(measured=False)))
@@ -1,4 +1,5 @@
 from OpenGL.GL import *
+from . import resources
 import numpy as np
 from functools import singledispatch
 
@@ -26,7 +27,7 @@ def create_with_data(data: np.ndarray, slot, format=None, internal_format=None,
 	mipmap_level = 0
 
 	# create texture
-	tex = glGenTextures(1)
+	tex = resources.textures(1)
 
 	# upload data
 	glActiveTexture(GL_TEXTURE0+slot)
@@ -58,7 +59,7 @@ def create_with_data(data: np.ndarray, slot, format=None, internal_format=None,
 @create.register
 def create_with_size(size: tuple, slot, format, wrap_s=None, wrap_t=None, border_color=None):
 	logging.debug("create texture with size")
-	tex = glGenTextures(1)
+	tex = resources.textures(1)
 	glActiveTexture(GL_TEXTURE0+slot)
 	glBindTexture(GL_TEXTURE_2D, tex)
 	glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
@@ -0,0 +1,65 @@
+from OpenGL.GL import *
+from . import resources
+import numpy as np
+
+# std140 uniform blocks by name -> binding point, shared by all programs.
+# programs created by puregl.program bind the blocks they declare on creation.
+BINDINGS = {
+	'Camera': 0,
+	'Lights': 1
+}
+
+
+def bind_blocks(program):
+	"""bind the known uniform blocks of the program to their binding points"""
+	for block, binding in BINDINGS.items():
+		index = glGetUniformBlockIndex(program, block)
+		if index != GL_INVALID_INDEX:
+			glUniformBlockBinding(program, index, binding)
+
+
+def block_size(program, block):
+	"""size of the block in the program in bytes, 0 when not declared"""
+	index = glGetUniformBlockIndex(program, block)
+	if index == GL_INVALID_INDEX:
+		return 0
+	return int(glGetActiveUniformBlockiv(program, index, GL_UNIFORM_BLOCK_DATA_SIZE))
+
+
+class UniformBuffer:
+	"""
+	uniform buffer for a std140 block laid out by a numpy structured dtype
+
+	fill `data`, then upload() writes it with a single glBufferSubData,
+	or nothing when it is unchanged since the last upload
+	"""
+	def __init__(self, block, dtype, usage=GL_DYNAMIC_DRAW):
+		self.block = block
+		self.binding = BINDINGS[block]
+		self.data = np.zeros((), dtype=dtype)
+		self._uploaded = None
+
+		self.buffer = resources.buffers(1)
+		glBindBuffer(GL_UNIFORM_BUFFER, self.buffer)
+		glBufferData(GL_UNIFORM_BUFFER, self.data.nbytes, None, usage)
+		glBindBuffer(GL_UNIFORM_BUFFER, 0)
+		glBindBufferBase(GL_UNIFORM_BUFFER, self.binding, self.buffer)
+
+	def validate(self, program):
+		"""raise when the block declared by the program is larger than the dtype"""
+		size = block_size(program, self.block)
+		if size > self.data.nbytes:
+			raise ValueError("uniform block {} is {} bytes in the program, {} in the dtype".format(self.block, size, self.data.nbytes))
+
+	def upload(self):
+		data = self.data.tobytes()
+		if data == self._uploaded:
+			return False
+		glBindBuffer(GL_UNIFORM_BUFFER, self.buffer)
+		glBufferSubData(GL_UNIFORM_BUFFER, 0, len(data), data)
+		glBindBuffer(GL_UNIFORM_BUFFER, 0)
+		self._uploaded = data
+		return True
+
+	def delete(self):
+		resources.delete('buffer', self.buffer)
@@ -0,0 +1,87 @@
+"""Compile programs ahead of their first use
+
+	warmup = puregl.warmup.Warmup([glsl.read("graphics/geometry"), ...])
+	warmup.start()
+	while not warmup.poll(): # once per frame
+		...
+
+with GL_KHR_parallel_shader_compile or GL_ARB_parallel_shader_compile the driver
+compiles on its own threads and poll() only collects the finished programs.
+without it nothing is compiled ahead and each poll() builds a single program,
+spreading the cost over frames.
+finished programs are memoized by puregl.program.create.
+"""
+from OpenGL.GL import *
+from OpenGL.error import NullFunctionError
+from . import program
+import logging
+import time
+
+EXTENSIONS = ("GL_KHR_parallel_shader_compile", "GL_ARB_parallel_shader_compile")
+
+
+def extensions():
+	return {glGetStringi(GL_EXTENSIONS, i).decode('utf-8') for i in range(glGetIntegerv(GL_NUM_EXTENSIONS))}
+
+
+def enable_parallel_compile()->bool:
+	"""let the driver use all its compiler threads, False when not supported"""
+	available = extensions()
+	for extension in EXTENSIONS:
+		if extension not in available:
+			continue
+		try:
+			if extension == "GL_KHR_parallel_shader_compile":
+				from OpenGL.GL.KHR.parallel_shader_compile import glMaxShaderCompilerThreadsKHR as max_threads
+			else:
+				from OpenGL.GL.ARB.parallel_shader_compile import glMaxShaderCompilerThreadsARB as max_threads
+			max_threads(0xFFFFFFFF)
+		except (ImportError, NullFunctionError):
+			# compiles in parallel with the driver default thread count
+			pass
+		return True
+	return False
+
+
+class Warmup:
+	def __init__(self, sources):
+		"""sources: (vs, fs) or (vs, fs, gs) tuples, as returned by glsl.read"""
+		self.sources = list(dict.fromkeys(tuple(s) for s in sources))
+		self.parallel = False
+		self._pending = []
+		self.started = None
+		self.finished = None
+
+	def start(self):
+		self.started = time.perf_counter()
+		self.parallel = enable_parallel_compile()
+		if self.parallel:
+			# the driver compiles them all on its threads
+			for sources in self.sources:
+				program.prefetch(*sources)
+		self._pending = list(self.sources)
+		logging.debug("warm up {} programs, parallel compile: {}".format(len(self._pending), self.parallel))
+
+	@property
+	def done(self):
+		return self.started is not None and not self._pending
+
+	@property
+	def progress(self):
+		return 1.0-len(self._pending)/len(self.sources) if self.sources else 1.0
+
+	def poll(self)->bool:
+		"""collect finished programs without waiting, True when all are ready"""
+		if self.started is None:
+			self.start()
+		for sources in list(self._pending):
+			if self.parallel and not program.is_ready(*sources):
+				continue
+			program.create(*sources)
+			self._pending.remove(sources)
+			if not self.parallel:
+				break
+		if not self._pending and self.finished is None:
+			self.finished = time.perf_counter()
+			logging.debug("warmed up {} programs in {:.0f}ms".format(len(self.sources), (self.finished-self.started)*1000))
+		return not self._pending
@@ -0,0 +1,133 @@
+"""Numbered image sequences
+
+paths like `shot.%04d.exr` or `shot.####.png` address one image per frame,
+frame numbers are the numbers in the file names.
+note: opencv reads EXR only with OPENCV_IO_ENABLE_OPENEXR=1 set before import
+"""
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+import cv2
+import numpy as np
+
+# the frame number placeholder comes right before the extension
+_printfPattern = re.compile(r"%(0?)(\d*)d(?=\.[^.]+$)")
+_hashPattern = re.compile(r"#+(?=\.[^.]+$)")
+
+
+def isSequence(path)->bool:
+    """True for patterns like `shot.%04d.exr` or `shot.####.png`, not for existing files with # in the name"""
+    name = os.path.basename(str(path))
+    if not (_printfPattern.search(name) or _hashPattern.search(name)):
+        return False
+    return not os.path.isfile(str(path))
+
+
+def _fileRegex(name: str):
+    """regex matching the file names of the pattern, with the frame number as group 1"""
+    match = _printfPattern.search(name) or _hashPattern.search(name)
+    if match.re is _printfPattern:
+        padding = int(match.group(2) or 0)
+    else:
+        padding = len(match.group(0))
+    digits = r"(\d{%d,})" % padding if padding else r"(\d+)"
+    return re.compile(re.escape(name[:match.start()])+digits+re.escape(name[match.end():])+"$")
+
+
+def filename(path, frame)->str:
+    """file name of frame in the sequence"""
+    path = str(path)
+    folder, name = os.path.split(path)
+    match = _printfPattern.search(name)
+    if match:
+        name = name[:match.start()]+(match.group(0) % frame)+name[match.end():]
+    else:
+        match = _hashPattern.search(name)
+        name = name[:match.start()]+str(frame).zfill(len(match.group(0)))+name[match.end():]
+    return os.path.join(folder, name)
+
+
+_indices = dict()
+_indicesLock = threading.Lock()
+def frameIndex(path)->dict:
+    """frame number -> file path, the directory is scanned once per pattern"""
+    path = str(path)
+    with _indicesLock:
+        if path not in _indices:
+            folder, name = os.path.split(path)
+            regex = _fileRegex(name)
+            index = dict()
+            try:
+                entries = os.listdir(folder or ".")
+            except OSError:
+                entries = []
+            for entry in entries:
+                match = regex.match(entry)
+                if match:
+                    index[int(match.group(1))] = os.path.join(folder, entry)
+            _indices[path] = index
+        return _indices[path]
+
+
+def frameRange(path):
+    """first and last frame number, or None for an empty sequence"""
+    index = frameIndex(path)
+    if not index:
+        return None
+    return min(index), max(index)
+
+
+def imread(path, frame)->np.ndarray:
+    filePath = frameIndex(path).get(frame)
+    if filePath is None:
+        return None
+    return cv2.imread(filePath, cv2.IMREAD_UNCHANGED if filePath.lower().endswith(".exr") else cv2.IMREAD_COLOR)
+
+
+# cv2.imread releases the GIL, so decoding scales with threads
+executor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="sequence")
+_pending = dict()
+_pendingLock = threading.Lock()
+
+
+def submit(path, frame, cache):
+    """decode frame in the pool into cache, returns a future of the image"""
+    key = (str(path), frame)
+    with _pendingLock:
+        future = _pending.get(key)
+        if future is not None and not future.cancelled():
+            return future
+
+        def job():
+            try:
+                img = imread(path, frame)
+                cache.put(path, frame, img)
+                return img
+            finally:
+                with _pendingLock:
+                    _pending.pop(key, None)
+        future = executor.submit(job)
+        _pending[key] = future
+        return future
+
+
+def prefetch(path, frames, cache):
+    """decode frames in parallel, frames already cached or missing on disk are skipped"""
+    index = frameIndex(path)
+    return [submit(path, frame, cache) for frame in frames if frame in index and not cache.contains(path, frame)]
+
+
+def read(path, frame, cache)->np.ndarray:
+    """decode frame, waiting for a prefetch of the same frame when one is in flight"""
+    while True:
+        try:
+            return submit(path, frame, cache).result()
+        except CancelledError:
+            # the prefetch was cancelled before it started, submit again
+            continue
+
+
+def invalidate(path):
+    with _indicesLock:
+        _indices.pop(str(path), None)
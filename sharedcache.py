@@ -0,0 +1,242 @@
+"""Frame cache shared between processes
+
+frames live in multiprocessing.shared_memory segments, one per slot, described
+by a small index (itself a shared memory segment of INDEX_DTYPE records).
+a SharedFrameCache created in the main process is handed to workers through
+inheritance, as a Process argument or with
+
+    Pool(initializer=sharedcache.initWorker, initargs=(cache,))
+
+after which sharedcache.worker is the cache in the worker. passing it through
+pool.map arguments fails, its lock can only be inherited. workers attach to the
+same segments and read frames zero-copy. acquire() increments the slot's
+reference count, a slot is only reused once nobody holds its frame. only the
+creating process frees the segments on close(), forked workers included.
+"""
+import os
+import time
+import hashlib
+import multiprocessing
+from multiprocessing import shared_memory
+from contextlib import contextmanager
+import numpy as np
+
+INDEX_DTYPE = np.dtype([
+    ('key', 'S40'),        # sha1 of the path
+    ('frame', 'i8'),
+    ('shape', 'i8', (3,)),
+    ('ndim', 'i4'),
+    ('dtype', 'S8'),
+    ('nbytes', 'i8'),      # capacity of the slot's segment
+    ('generation', 'i4'),  # bumped whenever the segment is replaced
+    ('refs', 'i4'),
+    ('ready', 'u1'),
+    ('lastUsed', 'f8')
+])
+
+
+def _key(path)->bytes:
+    return hashlib.sha1(str(path).encode('utf-8')).hexdigest().encode('ascii')
+
+
+def _attach(name)->shared_memory.SharedMemory:
+    """open an existing segment without handing it to this process' resource tracker"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # python < 3.13 always registers the segment
+        segment = shared_memory.SharedMemory(name=name)
+        _untrack(segment)
+        return segment
+
+
+def _untrack(segment):
+    # lifetime is managed by the owner of the cache, not by whichever
+    # process created or attached the segment
+    if os.name == 'posix':
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(segment._name, "shared_memory")
+
+
+class SharedFrameCache:
+    def __init__(self, slots=64):
+        self.slots = slots
+        self._lock = multiprocessing.Lock()
+        self._indexMemory = shared_memory.SharedMemory(create=True, size=INDEX_DTYPE.itemsize*slots)
+        _untrack(self._indexMemory)
+        self._pid = os.getpid() # the creating process frees the segments
+        self._attachIndex()
+        self._index[:] = np.zeros(slots, dtype=INDEX_DTYPE)
+
+    def _attachIndex(self):
+        self._index = np.ndarray((self.slots,), dtype=INDEX_DTYPE, buffer=self._indexMemory.buf)
+        self._segments = dict() # slot -> (generation, SharedMemory)
+
+    def __getstate__(self):
+        return {'slots': self.slots, 'name': self._indexMemory.name, 'lock': self._lock, 'pid': self._pid}
+
+    def __setstate__(self, state):
+        self.slots = state['slots']
+        self._lock = state['lock']
+        self._pid = state['pid']
+        self._indexMemory = _attach(state['name'])
+        self._attachIndex()
+
+    @property
+    def owner(self)->bool:
+        return os.getpid() == self._pid
+
+    @property
+    def name(self):
+        return self._indexMemory.name
+
+    def _segmentName(self, slot, generation):
+        return "{}_{}_{}".format(self.name, slot, generation)
+
+    def _segment(self, slot)->shared_memory.SharedMemory:
+        generation = int(self._index[slot]['generation'])
+        cached = self._segments.get(slot)
+        if cached is not None and cached[0] == generation:
+            return cached[1]
+        if cached is not None:
+            self._close(cached[1])
+        segment = _attach(self._segmentName(slot, generation))
+        self._segments[slot] = generation, segment
+        return segment
+
+    @staticmethod
+    def _close(segment, unlink=False):
+        try:
+            segment.close()
+        except BufferError:
+            # a view into the segment is still alive in this process
+            pass
+        if unlink:
+            if os.name == 'posix':
+                # unlink() unregisters from the tracker again
+                from multiprocessing import resource_tracker
+                resource_tracker.register(segment._name, "shared_memory")
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _find(self, key, frame):
+        index = self._index
+        found = np.nonzero((index['key'] == key) & (index['frame'] == frame) & (index['ready'] == 1))[0]
+        return int(found[0]) if len(found) else None
+
+    def _victim(self):
+        """an empty slot, or the least recently used one nobody holds"""
+        index = self._index
+        free = np.nonzero((index['refs'] == 0) & (index['ready'] == 0))[0]
+        if len(free):
+            return int(free[0])
+        unused = np.nonzero(index['refs'] == 0)[0]
+        if not len(unused):
+            return None
+        return int(unused[np.argmin(index['lastUsed'][unused])])
+
+    def contains(self, path, frame)->bool:
+        with self._lock:
+            return self._find(_key(path), frame) is not None
+
+    def put(self, path, frame, img: np.ndarray)->bool:
+        """copy img into a slot, returns False when every slot is in use"""
+        key = _key(path)
+        with self._lock:
+            if self._find(key, frame) is not None:
+                return True
+            slot = self._victim()
+            if slot is None:
+                return False
+
+            record = self._index[slot]
+            record['ready'] = 0
+            if record['nbytes'] < img.nbytes:
+                # replace with a larger segment
+                if record['nbytes'] > 0:
+                    self._close(self._segment(slot), unlink=True)
+                    self._segments.pop(slot, None)
+                record['generation'] += 1
+                segment = shared_memory.SharedMemory(name=self._segmentName(slot, int(record['generation'])), create=True, size=img.nbytes)
+                _untrack(segment)
+                self._segments[slot] = int(record['generation']), segment
+                record['nbytes'] = img.nbytes
+            segment = self._segment(slot)
+
+            np.ndarray(img.shape, dtype=img.dtype, buffer=segment.buf)[...] = img
+            record['key'] = key
+            record['frame'] = frame
+            record['shape'] = tuple(img.shape)+(0,)*(3-img.ndim)
+            record['ndim'] = img.ndim
+            record['dtype'] = img.dtype.str.encode('ascii')
+            record['lastUsed'] = time.time()
+            record['ready'] = 1
+            return True
+
+    @contextmanager
+    def acquire(self, path, frame):
+        """read-only view of the frame while inside the block, None when not cached"""
+        with self._lock:
+            slot = self._find(_key(path), frame)
+            if slot is not None:
+                record = self._index[slot]
+                record['refs'] += 1
+                record['lastUsed'] = time.time()
+                shape = tuple(record['shape'][:record['ndim']])
+                dtype = np.dtype(record['dtype'].decode('ascii'))
+                segment = self._segment(slot)
+
+        if slot is None:
+            yield None
+            return
+
+        img = None
+        try:
+            img = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+            img.flags.writeable = False
+            yield img
+        finally:
+            del img
+            with self._lock:
+                self._index[slot]['refs'] -= 1
+
+    @contextmanager
+    def frame(self, path, frame):
+        """like acquire, decoding the frame with read.read when it is not shared yet"""
+        with self.acquire(path, frame) as img:
+            if img is not None:
+                yield img
+                return
+
+        from editor.read import read
+        img = read(path, frame)
+        if img is None or not self.put(path, frame, img):
+            yield img
+            return
+        with self.acquire(path, frame) as shared:
+            yield shared if shared is not None else img
+
+    def close(self):
+        """detach this process, the owner also frees every segment"""
+        owner = self.owner
+        with self._lock:
+            if owner:
+                for slot in np.nonzero(self._index['nbytes'] > 0)[0]:
+                    self._close(self._segment(int(slot)), unlink=True)
+            else:
+                for generation, segment in self._segments.values():
+                    self._close(segment)
+            self._segments.clear()
+        del self._index
+        self._close(self._indexMemory, unlink=owner)
+
+
+worker = None # the cache of this worker process, set by initWorker
+
+
+def initWorker(cache):
+    """Pool initializer making the inherited cache available as sharedcache.worker"""
+    global worker
+    worker = cache
@@ -1,3 +1,11 @@
+import sys
+import time
+import hashlib
+import threading
+import functools
+from collections import OrderedDict
+
+
 def convert_cvImgToPixmap(cvImg):
 
     from PySide2.QtGui import QImage, QPixmap
@@ -8,24 +16,246 @@ def convert_cvImgToPixmap(cvImg):
     return QPixmap.fromImage(qImg)
 
 
+# every memoized function by name, to inspect and clear them from one place
+caches = dict()
+
+
+def sizeof(value)->int:
+    """approximate size of a cached value in bytes, ndarrays by their buffer"""
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value)+sum(sizeof(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class _Flight:
+    """a computation in progress, concurrent callers with the same key wait for it"""
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+        self.owner = threading.get_ident()
+
+
+_kwargsMark = object()
+_missing = object()
+
+
 class memoize:
-    def __init__(self, fn):
+    """Cache a function by its arguments
+
+        @memoize
+        def f(x): ...
+
+        @memoize(maxsize=128, maxbytes=512*1024**2, ttl=60)
+        def g(x): ...
+
+    maxsize: max number of entries, maxbytes: max total sizeof() of the values,
+    least recently used entries are evicted beyond either. ttl: seconds an entry stays valid.
+    disk: True or a diskcache.DiskCache, to keep results across processes and sessions.
+    only for pure functions whose arguments have a repr stable across processes.
+    thread safe, concurrent calls with the same arguments wait for a single evaluation.
+    """
+    def __init__(self, fn=None, maxsize=None, maxbytes=None, ttl=None, name=None, disk=None):
+        self.fn = None
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.ttl = ttl
+        self.name = name
+        self.disk = disk
+        self._identity = None
+        self.memo = OrderedDict() # key -> (value, nbytes, expires)
+        self.nbytes = 0
+        self._inflight = dict()
+        self._lock = threading.RLock()
+
+        # stats
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.diskHits = 0
+        self.failures = 0
+        self.totalTime = 0.0
+        self.maxTime = 0.0
+
+        if fn is not None:
+            self._wrap(fn)
+
+    def _wrap(self, fn):
         self.fn = fn
-        self.memo = dict()
+        functools.update_wrapper(self, fn)
+        if self.name is None:
+            self.name = "{}.{}".format(fn.__module__, fn.__qualname__)
+        caches[self.name] = self
+        if self.disk is True:
+            from editor import diskcache
+            self.disk = diskcache.default()
+        return self
+
+    def identity(self)->str:
+        """name and source of the function, so edits to it invalidate the disk tier"""
+        if self._identity is None:
+            import inspect
+            try:
+                source = inspect.getsource(self.fn)
+            except (OSError, TypeError):
+                source = self.fn.__code__.co_code.hex()
+            self._identity = "{}:{}".format(self.name, hashlib.sha1(source.encode('utf-8')).hexdigest())
+        return self._identity
+
+    def diskKey(self, args, kwargs)->str:
+        from editor.fingerprint import hashable
+        # strict, a collision would persist across sessions
+        return self.disk.key(self.identity(), hashable(args, strict=True), hashable(sorted(kwargs.items()), strict=True))
+
+    def key(self, args, kwargs):
+        key = args if not kwargs else args+(_kwargsMark,)+tuple(sorted(kwargs.items()))
+        try:
+            hash(key)
+        except TypeError:
+            # ndarrays and other unhashable arguments are keyed by content
+            from editor.fingerprint import hashable
+            key = hashable(key)
+        return key
+
+    def __call__(self, *args, **kwargs):
+        if self.fn is None:
+            # used as @memoize(...)
+            return self._wrap(*args)
+
+        key = self.key(args, kwargs)
+        with self._lock:
+            entry = self.memo.get(key)
+            if entry is not None:
+                value, nbytes, expires = entry
+                if expires is None or expires > time.monotonic():
+                    self.memo.move_to_end(key)
+                    self.hits+=1
+                    return value
+                self._remove(key)
+
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                self.misses+=1
+            elif flight.owner != threading.get_ident():
+                self.hits+=1
+
+        if not leader:
+            if flight.owner == threading.get_ident():
+                # waiting would deadlock, the result is computed further up this stack
+                raise RecursionError("{} called itself with the same arguments".format(self.name))
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        startTime = time.perf_counter()
+        try:
+            value = _missing
+            if self.disk is not None:
+                digest = self.diskKey(args, kwargs)
+                value = self.disk.get(digest, _missing)
+                if value is not _missing:
+                    self.diskHits+=1
+            if value is _missing:
+                value = self.fn(*args, **kwargs)
+                if self.disk is not None:
+                    self.disk.put(digest, value)
+        except BaseException as err:
+            flight.error = err
+            elapsed = time.perf_counter()-startTime
+            with self._lock:
+                # failed calls are misses too, keep meanTime per miss
+                self.failures+=1
+                self.totalTime += elapsed
+                self.maxTime = max(self.maxTime, elapsed)
+                del self._inflight[key]
+            flight.event.set()
+            raise
+        elapsed = time.perf_counter()-startTime
+
+        with self._lock:
+            self.totalTime += elapsed
+            self.maxTime = max(self.maxTime, elapsed)
+            self._store(key, value)
+            del self._inflight[key]
+        flight.value = value
+        flight.event.set()
+        return value
+
+    def _store(self, key, value):
+        nbytes = sizeof(value) if self.maxbytes is not None else 0
+        if self.maxbytes is not None and nbytes > self.maxbytes:
+            return
+        expires = time.monotonic()+self.ttl if self.ttl is not None else None
+        self.memo[key] = value, nbytes, expires
+        self.nbytes += nbytes
+        while self.memo and ((self.maxsize is not None and len(self.memo) > self.maxsize)
+                             or (self.maxbytes is not None and self.nbytes > self.maxbytes)):
+            self._remove(next(iter(self.memo)))
+            self.evictions+=1
+
+    def _remove(self, key):
+        value, nbytes, expires = self.memo.pop(key)
+        self.nbytes -= nbytes
+        return value
+
+    def contains(self, *args, **kwargs)->bool:
+        """True when a result for these arguments is cached in memory"""
+        key = self.key(args, kwargs)
+        with self._lock:
+            return key in self.memo
+
+    def pop(self, *args, **kwargs):
+        """forget the result for these arguments, returns it or None"""
+        key = self.key(args, kwargs)
+        with self._lock:
+            if key not in self.memo:
+                return None
+            return self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self.memo.clear()
+            self.nbytes = 0
+
+    def stats(self)->dict:
+        with self._lock:
+            return {
+                'entries': len(self.memo),
+                'nbytes': self.nbytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'diskHits': self.diskHits,
+                'failures': self.failures,
+                'meanTime': self.totalTime/self.misses if self.misses else 0.0,
+                'maxTime': self.maxTime
+            }
+
+
+def cacheStats()->dict:
+    return {name: cache.stats() for name, cache in caches.items()}
+
+
+def clearCaches():
+    for cache in caches.values():
+        cache.clear()
 
-    def __call__(self, *args):
-        if args not in self.memo:
-            self.memo[args] = self.fn(*args)
-        return self.memo[args]
 
-import time   
 import contextlib
 @contextlib.contextmanager
 def profile(name, disabled=False):
-    starttime = time.time()
-    yield
-    endtime = time.time()
-    deltatime = endtime-starttime
+    """print the fps of the block, also recorded as a profiler scope when the profiler is enabled"""
+    from editor import profiler
+    starttime = time.perf_counter_ns()
+    with profiler.scope(name):
+        yield
+    deltatime = (time.perf_counter_ns()-starttime)/1e9
     if not disabled:
         print("{} {:.0f} fps".format(name, 1/deltatime if deltatime>0 else float('inf')))
 
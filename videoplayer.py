@@ -9,7 +9,11 @@ def convert_cvImgToPixmap(cvImg):
     qImg = QImage(cvImg.data, width, height, bytesPerLine, QImage.Format_RGB888)
     return QPixmap.fromImage(qImg)
 
-import cv2
+import os
+from editor import read
+from editor import sequence
+from editor import profiler
+from editor.readahead import ReadAhead
 class ReadNode(QObject):
     frameChanged = Signal()
     pathChanged = Signal()
@@ -19,17 +23,16 @@ class ReadNode(QObject):
         super().__init__(parent=parent)
         self._frame = 0
         self._path = None
-        self._cap = None
         self.image = None
         self.dirty = False
+        self._readAhead = ReadAhead()
 
     def setPath(self, path):
         if self._path == path:
             return
 
-        self._cap = cv2.VideoCapture(path)
-        if not self._cap.isOpened():
-            self._cap = None
+        # dont open a decoder just to validate, read() opens pooled ones
+        if not (sequence.isSequence(path) or os.path.exists(path)):
             return
 
         self._path = path
@@ -50,17 +53,16 @@ class ReadNode(QObject):
     def frame(self):
         return self._frame
 
+    @profiler.profiled("ReadNode.evaluate")
     def evaluate(self):
         if self.path() is None:
             return
 
-        # if self.frame() is self._cap.get(cv2.CAP_PROP_POS_FRAMES-1):
-        #     return
-        if self._cap.get(cv2.CAP_PROP_POS_FRAMES)!=self._frame:
-            self._cap.set(cv2.CAP_PROP_POS_FRAMES, self._frame)
-        ret, cvImg = self._cap.read()
+        # current frame is usually cached by the read-ahead of the previous ones
+        cvImg = read.read(self._path, self._frame)
+        self._readAhead.request(self._path, self._frame)
 
-        if not ret:
+        if cvImg is None:
             return
 
         self.image = cvImg
@@ -175,7 +177,10 @@ if __name__ == "__main__":
             # sync view to model
             def syncReadGraphics():
                 if readNode.image is not None:
-                    readGraphics.setPixmap( convert_cvImgToPixmap(readNode.image) )
+                    with profiler.scope("convert"):
+                        pixmap = convert_cvImgToPixmap(readNode.image)
+                    with profiler.scope("paint"):
+                        readGraphics.setPixmap( pixmap )
             readNode.imageChanged.connect(syncReadGraphics)
 
     """ node editor """
@@ -1,28 +1,213 @@
+import os
 import cv2
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from editor import sequence
+
+
 class VideoWriter():
-	def __init__(self, filename, fps=24, fourcc="mp4v"):
+	"""
+	asynchronous: encode in a dedicated thread, write() only queues the frame.
+	the queue holds at most maxQueue frames, write() blocks when it is full.
+	encoder errors are raised by the next write() or on __exit__, once failed
+	every later write() raises the same error, frames after it are dropped.
+	stats(): fps is frames over the time since the first write(), including
+	time blocked on a full queue, encodeFps counts the time in the encoder only
+	"""
+	def __init__(self, filename, fps=24, fourcc="mp4v", asynchronous=False, maxQueue=8):
 		self.filename = filename
 		self._cap = None
 		self.fps = fps
 		self.fourcc = fourcc
 
+		# async
+		self.asynchronous = asynchronous
+		self._queue = queue.Queue(maxsize=maxQueue)
+		self._thread = None
+		self._error = None
+
+		# stats
+		self.framesWritten = 0
+		self._encodeTime = 0.0
+		self._startTime = None
+
 	def __enter__(self):
 		print("enter")
 		return self
 
-	def write(self, image):
+	def _encode(self, image):
 		if self._cap is None:
 			fourcc = cv2.VideoWriter_fourcc(*self.fourcc)
 			fps = self.fps
 			height, width, channels = image.shape
 			self._cap = cv2.VideoWriter(str(self.filename), fourcc, fps, (width, height))
 
+		startTime = time.perf_counter()
 		self._cap.write(image)
+		self._encodeTime += time.perf_counter()-startTime
+		self.framesWritten+=1
 
-	def __exit__(self, type, value, traceback):
-		print("exit")
+	def _run(self):
+		while True:
+			image = self._queue.get()
+			if image is None:
+				break
+			if self._error is not None:
+				# drain, so a blocked write() can return and see the error
+				continue
+			try:
+				self._encode(image)
+			except Exception as err:
+				self._error = err
+
+	def _raiseError(self):
+		# stays set, the output would have a gap
+		if self._error is not None:
+			raise self._error
+
+	def write(self, image):
+		if self._startTime is None:
+			self._startTime = time.perf_counter()
+
+		if not self.asynchronous:
+			self._encode(image)
+			return
+
+		self._raiseError()
+		if self._thread is None:
+			self._thread = threading.Thread(target=self._run, name="VideoWriter", daemon=True)
+			self._thread.start()
+		# the caller may reuse its buffer for the next frame
+		self._queue.put(image.copy())
+
+	@property
+	def queueDepth(self):
+		return self._queue.qsize()
+
+	def stats(self):
+		elapsed = time.perf_counter()-self._startTime if self._startTime is not None else 0.0
+		return {
+			'frames': self.framesWritten,
+			'queueDepth': self.queueDepth,
+			'fps': self.framesWritten/elapsed if elapsed>0 else 0.0,
+			'encodeFps': self.framesWritten/self._encodeTime if self._encodeTime>0 else 0.0
+		}
+
+	def close(self):
+		if self._thread is not None:
+			self._queue.put(None)
+			self._thread.join()
+			self._thread = None
 		if self._cap is not None:
 			self._cap.release()
+			self._cap = None
+
+	def __exit__(self, type, value, traceback):
+		print("exit")
+		self.close()
+		if type is None:
+			self._raiseError()
+
+
+def _encodeImage(filename, image, params):
+	"""encode into a temp file next to filename, runs in a worker process"""
+	ext = os.path.splitext(filename)[1]
+	ret, data = cv2.imencode(ext, image, params)
+	if not ret:
+		raise IOError("cant encode {}".format(filename))
+	tmp = "{}.{}.tmp".format(filename, os.getpid())
+	with open(tmp, 'wb') as f:
+		f.write(data.tobytes())
+	return tmp
+
+
+class ImageSequenceWriter():
+	"""
+	write frames to an image sequence like `shot.%04d.png` or `shot.####.exr`
+	frames are encoded in a process pool and may be written out of order.
+	each file is encoded to a temp file and renamed into place, so a file on
+	disk is never partial. frames in flight are renamed in frame order.
+	at most maxPending frames are in flight, write() waits beyond that.
+	write() may be called from several threads.
+	"""
+	def __init__(self, pattern, workers=None, maxPending=None, params=()):
+		self.pattern = pattern
+		self.params = list(params)
+		self._workers = workers or os.cpu_count()
+		self.maxPending = maxPending or 2*self._workers
+		self._executor = None
+		self._pending = dict() # frame -> future of the temp file
+		self._nextFrame = 0
+		self.framesWritten = 0
+		self._lock = threading.RLock()
+
+	def __enter__(self):
+		return self
+
+	def write(self, image, frame=None):
+		with self._lock:
+			if frame is None:
+				frame = self._nextFrame
+			self._nextFrame = frame+1
+
+			if self._executor is None:
+				self._executor = ProcessPoolExecutor(max_workers=self._workers)
+
+			if frame in self._pending:
+				raise ValueError("frame {} is already being written".format(frame))
+			filename = sequence.filename(self.pattern, frame)
+			self._pending[frame] = self._executor.submit(_encodeImage, filename, image, self.params)
+
+			self._commit()
+			while len(self._pending) >= self.maxPending:
+				# backpressure: wait for the oldest frame
+				self._commit(wait=True)
+
+	def _commit(self, wait=False):
+		"""rename encoded frames into place, in frame order"""
+		with self._lock:
+			for frame in sorted(self._pending):
+				future = self._pending[frame]
+				if not wait and not future.done():
+					break
+				tmp = future.result()
+				os.replace(tmp, sequence.filename(self.pattern, frame))
+				del self._pending[frame]
+				self.framesWritten+=1
+				wait = False
+
+	def close(self):
+		with self._lock:
+			try:
+				while self._pending:
+					self._commit(wait=True)
+			finally:
+				for future in self._pending.values():
+					future.cancel()
+				if self._executor is not None:
+					self._executor.shutdown()
+					self._executor = None
+				# frames encoded after a failure are never renamed into place
+				for future in self._pending.values():
+					if future.cancelled() or future.exception() is not None:
+						continue
+					try:
+						os.remove(future.result())
+					except OSError:
+						pass
+				self._pending.clear()
+
+	def __exit__(self, type, value, traceback):
+		try:
+			self.close()
+		except Exception as err:
+			if type is None:
+				raise
+			# dont hide the error the block is exiting with
+			logging.error("writing {} failed: {}".format(self.pattern, err))
 
 
 if __name__ == "__main__":